@@ -1,4 +1,7 @@
 
+# Standalone single-file build (legacy bl_info install). The extension package
+# only loads __init__.py and never imports this module, so the two never
+# register their panel and operators side by side.
 bl_info = {
     "name": "Keymap Visualizer - Enhanced Layout",
     "author": "ChatGPT + User",
@@ -10,7 +13,13 @@ bl_info = {
 }
 
 import bpy
-import platform
+import functools
+import re
+import sys
+
+import numpy as np
+
+_IS_DARWIN = sys.platform == 'darwin'
 
 editor_map = {
     'EMPTY': 'Window',
@@ -40,119 +49,270 @@ editor_map = {
     'CHANNELS': 'Animation Channels',
 }
 
-qwerty_keys = [
-    ['ESC', 'F1', 'F2', 'F3', 'F4', 'F5', 'F6', 'F7', 'F8', 'F9', 'F10', 'F11', 'F12'],
-    ['`', '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '=', 'DELETE'],
-    ['TAB', 'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P', '[', ']', '\\'],
-    ['A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L', ';', "'", 'RETURN'],
-    ['Z', 'X', 'C', 'V', 'B', 'N', 'M', ',', '.', '/'],
-    ['SPACE', 'ENTER', 'BACK_SPACE']
-]
-
-numpad_keys = [
-    ['F16', 'F17', 'F18', 'F19'],
-    [' ', '=', '/', '*'],
-    ['7', '8', '9', '-'],
-    ['4', '5', '6', '+'],
-    ['1', '2', '3', ' '],
-    [' ', '0', '.', 'ENTER']
-]
-
-cursor_keys = [
-    ['F13', 'F14', 'F15'],
-    ['INSERT', 'HOME', 'PAGE_UP'],
-    ['DELETE', 'END', 'PAGE_DOWN'],
-    [' ', ' ', ' '],
-    [' ', ' ', ' '],
-    [' ', ' ', ' '],
-    [' ', ' ', ' '],
-    [' ', 'UP', ' '],
-    ['DOWN', 'LEFT', 'RIGHT']
-
-]
+qwerty_keys = (
+    ('ESC', 'F1', 'F2', 'F3', 'F4', 'F5', 'F6', 'F7', 'F8', 'F9', 'F10', 'F11', 'F12'),
+    ('`', '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '=', 'DELETE'),
+    ('TAB', 'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P', '[', ']', '\\'),
+    ('A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L', ';', "'", 'RETURN'),
+    ('Z', 'X', 'C', 'V', 'B', 'N', 'M', ',', '.', '/'),
+    ('SPACE', 'ENTER', 'BACK_SPACE')
+)
+
+numpad_keys = (
+    ('F16', 'F17', 'F18', 'F19'),
+    (' ', '=', '/', '*'),
+    ('7', '8', '9', '-'),
+    ('4', '5', '6', '+'),
+    ('1', '2', '3', ' '),
+    (' ', '0', '.', 'ENTER')
+)
+
+# Blender key names for the numpad grid, resolved once instead of per cell
+NUMPAD_PASSTHROUGH = frozenset(('ENTER', '/', '*', '-', '+', '.', '='))
+numpad_labels = tuple(tuple(k if k in NUMPAD_PASSTHROUGH else f"NUMPAD_{k}" for k in row) for row in numpad_keys)
+
+cursor_keys = (
+    ('F13', 'F14', 'F15'),
+    ('INSERT', 'HOME', 'PAGE_UP'),
+    ('DELETE', 'END', 'PAGE_DOWN'),
+    (' ', ' ', ' '),
+    (' ', ' ', ' '),
+    (' ', ' ', ' '),
+    (' ', ' ', ' '),
+    (' ', 'UP', ' '),
+    ('DOWN', 'LEFT', 'RIGHT')
+)
+
+# Button grids as rows of (text, Blender key, scale_x) cells; cursor spacers have no key
+KEY_GRID = {
+    'qwerty': tuple(tuple((k, k, 1.0) for k in row) for row in qwerty_keys),
+    'cursor': tuple(
+        tuple((k, k, 1.0) if k != ' ' else (None, None, 0.5) for k in row) for row in cursor_keys
+    ),
+    'numpad': tuple(
+        tuple((k, key, 1.0) for k, key in zip(row, label_row))
+        for row, label_row in zip(numpad_keys, numpad_labels)
+    ),
+}
+
+
+_SCAN_CACHE = {}
+_CONFLICT_CACHE = {}
+_KM_INDEX = {'version': None, 'by_space': {}, 'relevant': {}, 'items': {}, 'arrays': {}}
+
+
+def clear_results_cache(self=None, context=None):
+    _SCAN_CACHE.clear()
+    _CONFLICT_CACHE.clear()
+
+
+def clear_scan_cache(self=None, context=None):
+    clear_results_cache()
+    _KM_INDEX['version'] = None
+    _KM_INDEX['by_space'] = {}
+    _KM_INDEX['relevant'] = {}
+    _KM_INDEX['items'] = {}
+    _KM_INDEX['arrays'] = {}
+    _relevant_by_name.cache_clear()
+
 
 class KeymapCheckerPrefs(bpy.types.PropertyGroup):
     editor: bpy.props.EnumProperty(
         name="Editor",
         items=[(k, v, "") for k, v in editor_map.items()],
-        default='VIEW_3D'
+        default='VIEW_3D',
+        update=clear_scan_cache
     )
-    ctrl: bpy.props.BoolProperty(name="Ctrl", default=False)
-    shift: bpy.props.BoolProperty(name="Shift", default=False)
-    alt: bpy.props.BoolProperty(name="Alt", default=False)
-    cmd: bpy.props.BoolProperty(name="Cmd", default=False, description="Mac Command key") if platform.system() == 'Darwin' else bpy.props.BoolProperty(name="Cmd", default=False)
+    ctrl: bpy.props.BoolProperty(name="Ctrl", default=False, update=clear_results_cache)
+    shift: bpy.props.BoolProperty(name="Shift", default=False, update=clear_results_cache)
+    alt: bpy.props.BoolProperty(name="Alt", default=False, update=clear_results_cache)
+    cmd: bpy.props.BoolProperty(name="Cmd", default=False, description="Mac Command key", update=clear_results_cache)
     selected_key: bpy.props.StringProperty(name="Selected Key", default="")
+    show_conflicts: bpy.props.BoolProperty(name="Show Conflicts", default=False)
+
+
+# Keymap name keywords that tie a keymap to an editor beyond its space_type
+MATCH_MAP = {
+    'VIEW_3D': ("3D View", "Object Mode", "Mesh", "Sculpt", "Pose", "Armature", "Weight Paint", "Vertex Paint", "Tool:", "PME"),
+    'GRAPH_EDITOR': ("Graph Editor", "F-Curve", "Drivers"),
+    'DOPESHEET_EDITOR': ("Dopesheet", "Action", "Grease Pencil", "Shape Key"),
+    'NLA_EDITOR': ("NLA",),
+    'IMAGE_EDITOR': ("Image", "UV", "Mask"),
+    'NODE_EDITOR': ("Node Editor", "Shader", "Compositor", "Geometry"),
+    'SEQUENCE_EDITOR': ("Sequence", "Video"),
+    'FILE_BROWSER': ("File Browser",),
+    'TEXT_EDITOR': ("Text",),
+    'CONSOLE': ("Console",),
+    'CLIP_EDITOR': ("Clip", "Tracking", "Stabilization"),
+    'GREASE_PENCIL': ("Grease Pencil", "Draw", "Sculpt", "Paint"),
+    'MASK_EDITOR': ("Mask",),
+    'USER_INTERFACE': ("User Interface", "UI", "Window", "Screen"),
+    'VIEW_2D': ("View2D",),
+    'VIEW_2D_BUTTONS_LIST': ("Buttons List",),
+    'EMPTY': ("Window", "Screen", "Global", "PME"),
+    'SCREEN': ("Window", "Screen", "Global", "PME"),
+    'INFO': ("Info",),
+    'PROPERTIES': ("Property Editor", "Properties"),
+    'OUTLINER': ("Outliner",),
+    'TIMELINE': ("Frames", "Timeline"),
+    'MARKER': ("Markers",),
+    'ANIMATION': ("Animation",),
+    'CHANNELS': ("Channels", "Dope Sheet")
+}
 
+# One alternation per editor so a keymap name is scanned once, whatever the keyword count
+_MATCH_RE = {
+    editor: re.compile("|".join(re.escape(k) for k in keywords))
+    for editor, keywords in MATCH_MAP.items()
+}
 
-def is_relevant_keymap(km, editor):
-    name = km.name
-    space = km.space_type
 
+@functools.lru_cache(maxsize=512)
+def _relevant_by_name(editor, name, space):
     # Direct match
     if space == editor:
         return True
 
-    # Editor-specific logic
-    match_map = {
-        'VIEW_3D': ["3D View", "Object Mode", "Mesh", "Sculpt", "Pose", "Armature", "Weight Paint", "Vertex Paint", "Tool:", "PME"],
-        'GRAPH_EDITOR': ["Graph Editor", "F-Curve", "Drivers"],
-        'DOPESHEET_EDITOR': ["Dopesheet", "Action", "Grease Pencil", "Shape Key"],
-        'NLA_EDITOR': ["NLA"],
-        'IMAGE_EDITOR': ["Image", "UV", "Mask"],
-        'NODE_EDITOR': ["Node Editor", "Shader", "Compositor", "Geometry"],
-        'SEQUENCE_EDITOR': ["Sequence", "Video"],
-        'FILE_BROWSER': ["File Browser"],
-        'TEXT_EDITOR': ["Text"],
-        'CONSOLE': ["Console"],
-        'CLIP_EDITOR': ["Clip", "Tracking", "Stabilization"],
-        'GREASE_PENCIL': ["Grease Pencil", "Draw", "Sculpt", "Paint"],
-        'MASK_EDITOR': ["Mask"],
-        'USER_INTERFACE': ["User Interface", "UI", "Window", "Screen"],
-        'VIEW_2D': ["View2D"],
-        'VIEW_2D_BUTTONS_LIST': ["Buttons List"],
-        'EMPTY': ["Window", "Screen", "Global", "PME"],
-        'SCREEN': ["Window", "Screen", "Global", "PME"],
-        'INFO': ["Info"],
-        'PROPERTIES': ["Property Editor", "Properties"],
-        'OUTLINER': ["Outliner"],
-        'TIMELINE': ["Frames", "Timeline"],
-        'MARKER': ["Markers"],
-        'ANIMATION': ["Animation"],
-        'CHANNELS': ["Channels", "Dope Sheet"]
-    }
-
-    keywords = match_map.get(editor, [])
-    return any(k in name for k in keywords)
+    pattern = _MATCH_RE.get(editor)
+    return bool(pattern and pattern.search(name))
 
 
-def is_key_assigned(key, editor, ctrl, shift, alt, cmd):
+def is_relevant_keymap(km, editor):
+    return _relevant_by_name(editor, km.name, km.space_type)
+
+
+def _km_index_for(kc):
+    """_KM_INDEX rebuilt for kc if the keyconfig was switched or reloaded since it was filled."""
+    keymaps = kc.keymaps
+    version = (kc.as_pointer(), len(keymaps))
+    if _KM_INDEX['version'] != version:
+        by_space = {}
+        for pos, km in enumerate(keymaps):
+            by_space.setdefault(km.space_type, []).append((pos, km))
+        _KM_INDEX['version'] = version
+        _KM_INDEX['by_space'] = by_space
+        _KM_INDEX['relevant'] = {}
+        _KM_INDEX['items'] = {}
+        _KM_INDEX['arrays'] = {}
+    return _KM_INDEX
+
+
+def _relevant_keymaps(kc, editor):
+    """Keymaps of kc relevant to editor, in keyconfig order, via a space_type index."""
+    _km_index_for(kc)
+    relevant = _KM_INDEX['relevant'].get(editor)
+    if relevant is None:
+        by_space = _KM_INDEX['by_space']
+        # Same space_type is always relevant; other spaces only match by name
+        hits = list(by_space.get(editor, ()))
+        for space, entries in by_space.items():
+            if space != editor:
+                hits.extend(e for e in entries if is_relevant_keymap(e[1], editor))
+        hits.sort(key=lambda e: e[0])
+        relevant = [km for _pos, km in hits]
+        _KM_INDEX['relevant'][editor] = relevant
+    return relevant
+
+
+def _mod_mask(ctrl, shift, alt, cmd):
+    return (ctrl << 3) | (shift << 2) | (alt << 1) | cmd
+
+
+# Display string for every modifier mask built by _mod_mask
+MOD_LABELS = tuple(
+    "+".join(n for bit, n in ((8, "Ctrl"), (4, "Shift"), (2, "Alt"), (1, "Cmd")) if m & bit) or "None"
+    for m in range(16)
+)
+
+
+def _active_items(km):
+    """Snapshot of km's active items as (type, modifier mask, idname, name), kept per keyconfig version."""
+    km_ptr = km.as_pointer()
+    items = _KM_INDEX['items'].get(km_ptr)
+    if items is None:
+        items = [
+            (kmi.type, _mod_mask(kmi.ctrl, kmi.shift, kmi.alt, kmi.oskey), kmi.idname, kmi.name)
+            for kmi in km.keymap_items if kmi.active
+        ]
+        _KM_INDEX['items'][km_ptr] = items
+    return items
+
+
+def _editor_items(kc, editor):
+    """
+    All active items of the editor's keymaps as a modifier-mask array plus a
+    parallel list of (type, keymap name, idname, name) records.
+    """
+    arrays = _km_index_for(kc)['arrays'].get(editor)
+    if arrays is None:
+        records = []
+        masks = []
+        for km in _relevant_keymaps(kc, editor):
+            km_name = km.name
+            for k_type, mods, idname, name in _active_items(km):
+                records.append((k_type, km_name, idname, name))
+                masks.append(mods)
+        # int16: items with an "any" modifier state report -1 and go negative
+        arrays = (np.array(masks, dtype=np.int16), records)
+        _KM_INDEX['arrays'][editor] = arrays
+    return arrays
+
+
+def scan_keymap(editor, ctrl, shift, alt, cmd):
+    """
+    Walk the active keyconfig once for the editor and modifiers.
+    Returns (assigned key types, {key type: match labels}).
+    """
     wm = bpy.context.window_manager
-    keyconfigs = [wm.keyconfigs.active]
-    for kc in keyconfigs:
+    active = wm.keyconfigs.active
+    # len(keymaps) catches a keyconfig reload; property updates clear the rest.
+    cache_key = (editor, ctrl, shift, alt, cmd, active.as_pointer() if active else 0, len(active.keymaps) if active else 0)
+    cached = _SCAN_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    matches = {}
+    want = _mod_mask(ctrl, shift, alt, cmd)
+    keyconfigs = [('Active', active)]
+    for origin, kc in keyconfigs:
         if not kc:
             continue
-        for km in kc.keymaps:
-            if not is_relevant_keymap(km, editor):
-                continue
-            for kmi in km.keymap_items:
-                if kmi.type == key and kmi.active:
-                    if (kmi.ctrl == ctrl and kmi.shift == shift and kmi.alt == alt and kmi.oskey == cmd):
-                        return True
-    return False
+        masks, records = _editor_items(kc, editor)
+        for i in np.flatnonzero(masks == want):
+            k_type, km_name, idname, name = records[i]
+            label = f"{origin}: {km_name} > {idname}"
+            if name and name != idname:
+                label += f" ({name})"
+            # dict keeps first-seen order while dropping duplicates
+            matches.setdefault(k_type, {})[label] = None
 
+    result = (frozenset(matches), {k: list(labels) for k, labels in matches.items()})
+    _SCAN_CACHE[cache_key] = result
+    return result
+
+
+def is_key_assigned(key, editor, ctrl, shift, alt, cmd):
+    return key in scan_keymap(editor, ctrl, shift, alt, cmd)[0]
 
 
 def get_keymap_conflicts(key, current_editor, ctrl, shift, alt, cmd):
     """Search all other editors' keymaps for the same hotkey usage."""
-    results = []
     wm = bpy.context.window_manager
+    active = wm.keyconfigs.active
+    cache_key = (key, current_editor, ctrl, shift, alt, cmd, active.as_pointer() if active else 0, len(active.keymaps) if active else 0)
+    cached = _CONFLICT_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
-    for kc in [wm.keyconfigs.active]:
+    results = []
+    for kc in [active]:
         if not kc:
             continue
+        # Names of the current editor's own keymaps, from the per-keyconfig relevance index
+        own = frozenset(km.name for km in _relevant_keymaps(kc, current_editor))
         for km in kc.keymaps:
             # Skip current editor's own keymaps
-            if is_relevant_keymap(km, current_editor):
+            if km.name in own:
                 continue
 
             for kmi in km.keymap_items:
@@ -171,41 +331,14 @@ def get_keymap_conflicts(key, current_editor, ctrl, shift, alt, cmd):
                         label += f" ({kmi.name})"
                     results.append(label)
 
-    # Deduplicate
-    seen = set()
-    unique = []
-    for r in results:
-        if r not in seen:
-            seen.add(r)
-            unique.append(r)
+    # Deduplicate, preserving first-seen order
+    unique = list(dict.fromkeys(results))
+    _CONFLICT_CACHE[cache_key] = unique
     return unique
 
 
 def get_keymap_matches(key, editor, ctrl, shift, alt, cmd):
-    results = []
-    wm = bpy.context.window_manager
-    keyconfigs = [('Active', wm.keyconfigs.active)]
-    for origin, kc in keyconfigs:
-        if not kc:
-            continue
-        for km in kc.keymaps:
-            if not is_relevant_keymap(km, editor):
-                continue
-            for kmi in km.keymap_items:
-                if kmi.type == key and kmi.active:
-                    if (kmi.ctrl == ctrl and kmi.shift == shift and kmi.alt == alt and kmi.oskey == cmd):
-                        label = f"{origin}: {km.name} > {kmi.idname}"
-                        if kmi.name and kmi.name != kmi.idname:
-                            label += f" ({kmi.name})"
-                        results.append(label)
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_results = []
-        for r in results:
-            if r not in seen:
-                unique_results.append(r)
-                seen.add(r)
-        return unique_results
+    return scan_keymap(editor, ctrl, shift, alt, cmd)[1].get(key, [])
 
 class WM_OT_SelectKey(bpy.types.Operator):
     bl_idname = "wm.select_keymap_key"
@@ -214,13 +347,15 @@ class WM_OT_SelectKey(bpy.types.Operator):
 
     def execute(self, context):
         prefs = context.scene.keymap_checker
-        if is_key_assigned(self.key, prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd):
+        # Same memoized scan the panel draws from, so this is a set lookup
+        assigned, _ = scan_keymap(prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd)
+        if self.key in assigned:
             prefs.selected_key = self.key
-        for area in context.screen.areas:
-            if area.type == 'VIEW_3D':
-                for region in area.regions:
-                    if region.type == 'UI':
-                        region.tag_redraw()
+        # Invoked from the panel button, so the context region is the panel's
+        if context.region:
+            context.region.tag_redraw()
+        elif context.area:
+            context.area.tag_redraw()
         return {'FINISHED'}
 
 class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
@@ -231,6 +366,34 @@ class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
     bl_category = 'Keymap'
     bl_context = "objectmode"
 
+    @staticmethod
+    def draw_key_grid(box, grid, selected_key, assigned):
+        for cells in grid:
+            flow = box.grid_flow(row_major=True, columns=len(cells), even_columns=False, even_rows=False, align=True)
+            for text, key, scale in cells:
+                if scale != 1.0:
+                    col = flow.column()
+                    col.scale_x = scale
+                else:
+                    # Default width: the button needs no wrapping column of its own
+                    col = flow
+                if key is None:
+                    continue
+                props = col.operator("wm.select_keymap_key", text=text, depress=(selected_key == key), emboss=key in assigned)
+                props.key = key
+
+    @staticmethod
+    def draw_label_list(layout, lines, header=None):
+        """One boxed column of labels; emits nothing at all for an empty list."""
+        if not lines:
+            return
+        if header:
+            layout.separator()
+            layout.label(text=header)
+        lbl = layout.box().column(align=True).label
+        for line in lines:
+            lbl(text=line)
+
     def draw(self, context):
         layout = self.layout
         prefs = context.scene.keymap_checker
@@ -240,64 +403,39 @@ class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
         row.prop(prefs, "ctrl", toggle=True)
         row.prop(prefs, "shift", toggle=True)
         row.prop(prefs, "alt", toggle=True)
-        if platform.system() == 'Darwin':
+        if _IS_DARWIN:
             row.prop(prefs, "cmd", toggle=True)
         layout.separator()
 
+        assigned, _ = scan_keymap(prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd)
+
         # Keyboard section with darker background
         box = layout.box()
         box.label(text="Keyboard:")
-        for row_keys in qwerty_keys:
-            row = box.row(align=True)
-            for k in row_keys:
-                col = row.column()
-                col.scale_x = 1.0
-                is_used = is_key_assigned(k, prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd)
-                props = col.operator("wm.select_keymap_key", text=k, depress=(prefs.selected_key == k), emboss=is_used)
-                props.key = k
+        self.draw_key_grid(box, KEY_GRID['qwerty'], prefs.selected_key, assigned)
         layout.separator()
 
         # Split for Cursor and Numpad sections
         split = layout.split(factor=0.5)
-        
+
         # Cursor and Navigation Keys section with darker background
         col_left = split.column()
         box_left = col_left.box()
         box_left.label(text="Cursor and Navigation Keys:")
-        for row_keys in cursor_keys:
-            row = box_left.row(align=True)
-            for k in row_keys:
-                col = row.column()
-                col.scale_x = 1.0 if k != ' ' else 0.5
-                if k != ' ':
-                    is_used = is_key_assigned(k, prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd)
-                    props = col.operator("wm.select_keymap_key", text=k, depress=(prefs.selected_key == k), emboss=is_used)
-                    props.key = k
-        
+        self.draw_key_grid(box_left, KEY_GRID['cursor'], prefs.selected_key, assigned)
+
         # Numpad section with darker background
         col_right = split.column()
         box_right = col_right.box()
         box_right.label(text="Numpad:")
-        for row_keys in numpad_keys:
-            row = box_right.row(align=True)
-            for k in row_keys:
-                col = row.column()
-                col.scale_x = 1.0
-                k_label = k if k in ['ENTER', '/', '*', '-', '+', '.', '='] else f"NUMPAD_{k}"
-                is_used = is_key_assigned(k_label, prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd)
-                props = col.operator("wm.select_keymap_key", text=k, depress=(prefs.selected_key == k), emboss=is_used)
-                props.key = k_label
+        self.draw_key_grid(box_right, KEY_GRID['numpad'], prefs.selected_key, assigned)
         layout.separator()
 
         # Assignment Details section
         layout.label(text="Assignment Details:")
         if prefs.selected_key:
-            label = []
-            if prefs.ctrl: label.append("Ctrl")
-            if prefs.shift: label.append("Shift")
-            if prefs.alt: label.append("Alt")
-            if prefs.cmd and platform.system() == 'Darwin': label.append("Cmd")
-            mod_str = "+".join(label) if label else "None"
+            mask = _mod_mask(prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd and _IS_DARWIN)
+            mod_str = MOD_LABELS[mask]
             layout.label(text=f"Selected: {prefs.selected_key} with modifiers: {mod_str}")
             
             # Display assignments for the current editor
@@ -309,33 +447,38 @@ class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
                     row.alert = True  # Sets the text to red
                     row.label(text="CONFLICT:")
                     row.alert = False  # Reset alert to avoid affecting subsequent labels
-                for m in matches:
-                    layout.label(text=m)
+                self.draw_label_list(layout, matches)
             else:
                 layout.label(text="No assignment found in this editor.")
             
             # Display conflicts from other editors under "Also used in:"
-            conflicts = get_keymap_conflicts(prefs.selected_key, prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd)
-            if conflicts:
-                layout.separator()
-                layout.label(text="Also used in:")
-                for c in conflicts:
-                    layout.label(text=c)
+            # (the scan covers every other editor, so only run it on demand)
+            layout.prop(prefs, "show_conflicts", icon='TRIA_DOWN' if prefs.show_conflicts else 'TRIA_RIGHT', emboss=False)
+            if prefs.show_conflicts:
+                conflicts = get_keymap_conflicts(prefs.selected_key, prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd)
+                self.draw_label_list(layout, conflicts, header="Also used in:")
         else:
             layout.label(text="(Click an assigned key to view its assignment)")
 
-classes = [
+classes = (
     KeymapCheckerPrefs,
     WM_OT_SelectKey,
     VIEW3D_PT_KeymapChecker,
-]
+)
 
 def register():
+    clear_scan_cache()
     for cls in classes:
-        bpy.utils.register_class(cls)
+        try:
+            bpy.utils.register_class(cls)
+        except ValueError:
+            # Still registered from a previous run of this script: replace it
+            bpy.utils.unregister_class(cls)
+            bpy.utils.register_class(cls)
     bpy.types.Scene.keymap_checker = bpy.props.PointerProperty(type=KeymapCheckerPrefs)
 
 def unregister():
+    clear_scan_cache()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.keymap_checker
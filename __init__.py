@@ -1,17 +1,37 @@
 
 import bpy
-import platform
+import collections
+import functools
+import operator
+import re
+import sys
 from bpy.app.handlers import persistent
+from types import MappingProxyType
+
+IS_MAC = sys.platform == 'darwin'  # fixed for the process; avoids importing platform
 
 # ---------------------------------------------
 # Debug Control
 # ---------------------------------------------
 DEBUG_KEYMAPS = False  # Set to True to enable debug prints, False to disable
-_LAST_DEBUG_SIG = None  # for throttled debug prints
-
-def _debug_print(*args, **kwargs):
-    if DEBUG_KEYMAPS:
+_DEBUG_SEEN = collections.OrderedDict()  # recently printed sigs, for throttled debug prints
+_DEBUG_SEEN_MAX = 32
+
+if DEBUG_KEYMAPS:
+    def _debug_print(*args, sig=None, **kwargs):
+        """Print; with sig=, skip if that sig was printed recently."""
+        if sig is not None:
+            if sig in _DEBUG_SEEN:
+                _DEBUG_SEEN.move_to_end(sig)
+                return
+            _DEBUG_SEEN[sig] = None
+            if len(_DEBUG_SEEN) > _DEBUG_SEEN_MAX:
+                _DEBUG_SEEN.popitem(last=False)
         print(*args, **kwargs)
+else:
+    # Arguments are still evaluated, so hot call sites guard with `if DEBUG_KEYMAPS:`
+    def _debug_print(*args, sig=None, **kwargs):
+        pass
 
 # ---------------------------------------------
 # Editor map (space types and related scopes)
@@ -33,37 +53,77 @@ editor_map = {
     'EMPTY': 'Window',
     'SCREEN': 'Screen',
 }
+# Module-level so the enum items stay alive for as long as the class is registered
+_EDITOR_ITEMS = tuple((k, v, "") for k, v in editor_map.items())
+# Candidates for the "In other editors" section: every editor except the global scopes
+_NON_GLOBAL_EDITORS = tuple(ed for ed in editor_map if ed not in ('SCREEN', 'EMPTY'))
 
 # ---------------------------------------------
 # Keyboard layouts to render
 # ---------------------------------------------
-qwerty_keys = [
-    ['ESC', 'F1', 'F2', 'F3', 'F4', 'F5', 'F6', 'F7', 'F8', 'F9', 'F10', 'F11', 'F12'],
-    ['`', '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '=', 'DELETE'],
-    ['TAB', 'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P', '[', ']', '\\'],
-    ['A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L', ';', "'", 'RETURN'],
-    ['Z', 'X', 'C', 'V', 'B', 'N', 'M', ',', '.', '/'],
-    ['SPACE', 'ENTER', 'BACK_SPACE'],
-]
-numpad_keys = [
-    ['F16', 'F17', 'F18', 'F19'],
-    [' ', '=', '/', '*'],
-    ['7', '8', '9', '-'],
-    ['4', '5', '6', '+'],
-    ['1', '2', '3', ' '],
-    [' ', '0', '.', 'ENTER'],
-]
-cursor_keys = [
-    ['F13', 'F14', 'F15'],
-    ['INSERT', 'HOME', 'PAGE_UP'],
-    ['DELETE', 'END', 'PAGE_DOWN'],
-    [' ', ' ', ' '],
-    [' ', ' ', ' '],
-    [' ', ' ', ' '],
-    [' ', ' ', ' '],
-    [' ', 'UP', ' '],
-    ['DOWN', 'LEFT', 'RIGHT'],
-]
+qwerty_keys = (
+    ('ESC', 'F1', 'F2', 'F3', 'F4', 'F5', 'F6', 'F7', 'F8', 'F9', 'F10', 'F11', 'F12'),
+    ('`', '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '=', 'DELETE'),
+    ('TAB', 'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P', '[', ']', '\\'),
+    ('A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L', ';', "'", 'RETURN'),
+    ('Z', 'X', 'C', 'V', 'B', 'N', 'M', ',', '.', '/'),
+    ('SPACE', 'ENTER', 'BACK_SPACE'),
+)
+numpad_keys = (
+    ('F16', 'F17', 'F18', 'F19'),
+    (' ', '=', '/', '*'),
+    ('7', '8', '9', '-'),
+    ('4', '5', '6', '+'),
+    ('1', '2', '3', ' '),
+    (' ', '0', '.', 'ENTER'),
+)
+cursor_keys = (
+    ('F13', 'F14', 'F15'),
+    ('INSERT', 'HOME', 'PAGE_UP'),
+    ('DELETE', 'END', 'PAGE_DOWN'),
+    (' ', ' ', ' '),
+    (' ', ' ', ' '),
+    (' ', ' ', ' '),
+    (' ', ' ', ' '),
+    (' ', 'UP', ' '),
+    ('DOWN', 'LEFT', 'RIGHT'),
+)
+
+# Numpad cap text -> Blender event id; anything else (F16..F19) is already an id
+_NUMPAD_KEY_ID = {
+    **{d: f"NUMPAD_{d}" for d in "0123456789"},
+    '.': "NUMPAD_PERIOD",
+    '/': "NUMPAD_SLASH",
+    '*': "NUMPAD_ASTERIX",
+    '-': "NUMPAD_MINUS",
+    '+': "NUMPAD_PLUS",
+    'ENTER': "NUMPAD_ENTER",
+    '=': "NUMPAD_EQUALS",
+}
+
+def _numpad_key_id(k):
+    return _NUMPAD_KEY_ID.get(k, k)
+
+# Numpad grid as (cap text, key id) cells, resolved once; spacer cells carry key id None
+numpad_cells = tuple(
+    tuple((k, None if k == ' ' else _numpad_key_id(k)) for k in row)
+    for row in numpad_keys
+)
+
+# Key id (as stored in selected_key / the highlight cache) -> (section, row, col), first occurrence wins
+KEY_INDEX = {}
+for _section, _grid, _to_id in (
+    ("qwerty", qwerty_keys, str),
+    ("cursor", cursor_keys, str),
+    ("numpad", numpad_keys, _numpad_key_id),
+):
+    for _r, _row in enumerate(_grid):
+        for _c, _k in enumerate(_row):
+            if _k != ' ':
+                KEY_INDEX.setdefault(_to_id(_k), (_section, _r, _c))
+KEY_INDEX = MappingProxyType(KEY_INDEX)
+_ALL_KEYS = tuple(KEY_INDEX)  # every key id once, in layout order (plain tuple for hot loops)
+del _section, _grid, _to_id, _r, _row, _c, _k
 
 # ---------------------------------------------
 # Properties
@@ -71,7 +131,7 @@ cursor_keys = [
 class KeymapCheckerPrefs(bpy.types.PropertyGroup):
     editor: bpy.props.EnumProperty(
         name="Editor",
-        items=[(k, v, "") for k, v in editor_map.items()],
+        items=_EDITOR_ITEMS,
         default='VIEW_3D'
     )
     screen_always_on: bpy.props.BoolProperty(
@@ -89,53 +149,114 @@ class KeymapCheckerPrefs(bpy.types.PropertyGroup):
     alt: bpy.props.BoolProperty(name="Alt", default=False)
     cmd: bpy.props.BoolProperty(
         name="Cmd", default=False,
-        description="Mac Command key"
-    ) if platform.system() == 'Darwin' else bpy.props.BoolProperty(name="Cmd", default=False)
+        description="Mac Command key" if IS_MAC else ""
+    )
     selected_key: bpy.props.StringProperty(name="Selected Key", default="")
 
 # ---------------------------------------------
 # Helpers
 # ---------------------------------------------
 
+@functools.lru_cache(maxsize=1024)
+def _lc(text):
+    """Lower-cased operator id / name; the same few hundred strings recur across scans."""
+    return (text or "").lower()
+
+# Every KeyMapItem carries these RNA properties, so one C-level getter replaces a getattr chain
+_KMI_SIG_GET = operator.attrgetter("type", "ctrl", "shift", "alt", "oskey", "any", "value", "key_modifier")
+
+# Interning tables: each distinct name gets a small int for the life of the session
+_KM_ID = {}
+_IDN_ID = {}
+_TYPE_ID = {}
+_VALUE_ID = {}
+_KEYMOD_ID = {}
+_MOD_ANY = 1 << 8  # modifier bits when kmi.any makes ctrl/shift/alt/oskey irrelevant
+
+def _intern_id(table, name):
+    i = table.get(name)
+    if i is None:
+        # Interned on first sight only; later lookups hit the table with RNA's fresh strings
+        i = table[sys.intern(name)] = len(table)
+    return i
+
 def _full_binding_sig(km, kmi):
-    """Exact binding identity: key + mods + value + key_modifier + operator scope."""
+    """
+    Exact binding identity: key + mods + value + key_modifier + operator scope,
+    packed as (keymap id, operator id, bits) so set lookups hash three ints.
+    """
+    key_type, ctrl, shift, alt, oskey, any_mod, value, key_modifier = _KMI_SIG_GET(kmi)
+    if any_mod:
+        # Individual modifier flags are ignored by Blender when 'any' is set
+        mods = _MOD_ANY
+    else:
+        # Modifiers may be bools or -1/0/1 ints (Blender 4.x), so each gets two bits
+        mods = (ctrl & 3) | (shift & 3) << 2 | (alt & 3) << 4 | (oskey & 3) << 6
+    bits = (
+        _intern_id(_TYPE_ID, key_type) << 32
+        | _intern_id(_KEYMOD_ID, key_modifier) << 16
+        | _intern_id(_VALUE_ID, value) << 9
+        | mods
+    )
+    return (_intern_id(_KM_ID, km.name), _intern_id(_IDN_ID, kmi.idname), bits)
+
+_DISABLED_CACHE = {"sig": None, "value": None}
+_DRAW_CACHE = {}  # draw signature -> DrawData rows for the panel's details sections
+_DRAW_CACHE_MAX = 64
+
+def _keyconfig_version():
+    """Cheap token that changes when the user/active keyconfigs are swapped, reloaded or edited."""
+    wm = bpy.context.window_manager
+    user = getattr(wm.keyconfigs, "user", None)
+    active = getattr(wm.keyconfigs, "active", None)
     return (
-        km.name or "",
-        kmi.idname or "",
-        getattr(kmi, "type", None),
-        bool(getattr(kmi, "ctrl", False)),
-        bool(getattr(kmi, "shift", False)),
-        bool(getattr(kmi, "alt", False)),
-        bool(getattr(kmi, "oskey", False)),
-        bool(getattr(kmi, "any", False)),
-        getattr(kmi, "value", "PRESS"),
-        getattr(kmi, "key_modifier", "NONE"),
+        user.as_pointer() if user else 0,
+        active.as_pointer() if active else 0,
+        active.name if active else None,
+        len(user.keymaps) if user else 0,
+        getattr(bpy.context.preferences, "is_dirty", None),
     )
 
-def _collect_disabled_binding_sigs():
+def _collect_disabled_binding_sigs(hide_modal=False):
     """
     Disabled binding mask from user/active keyconfigs keyed by FULL binding (not just operator/name).
     Prevents 'disabled in User' from leaking in via Add-on, but only for the exact binding.
+    With hide_modal, modal keymaps are skipped since callers never look them up.
+    Both variants come from one walk, memoized on _keyconfig_version(), so toggling
+    hide_modal is a dict lookup; clear_keymap_cache() drops them.
     """
-    disabled = set()
-    wm = bpy.context.window_manager
-    for kc in (getattr(wm.keyconfigs, "user", None), getattr(wm.keyconfigs, "active", None)):
-        if not kc:
-            continue
-        for km in kc.keymaps:
-            for kmi in km.keymap_items:
-                if not getattr(kmi, "active", True):
-                    disabled.add(_full_binding_sig(km, kmi))
-    return disabled
+    version = _keyconfig_version()
+    if _DISABLED_CACHE["sig"] != version:
+        wm = bpy.context.window_manager
+        sig_of = _full_binding_sig
+        plain, modal = set(), set()
+        for kc in (wm.keyconfigs.user, wm.keyconfigs.active):
+            if not kc:
+                continue
+            for km in kc.keymaps:
+                target = modal if km.is_modal else plain
+                target.update(sig_of(km, kmi) for kmi in km.keymap_items if not kmi.active)
+        _DISABLED_CACHE["sig"] = version
+        _DISABLED_CACHE["value"] = {True: frozenset(plain), False: frozenset(plain | modal)}
+    return _DISABLED_CACHE["value"][bool(hide_modal)]
 
 # ============================================================
 # HIGHLIGHT CACHE — ASSIGNED CONTEXT (filtered) OR RAW GLOBALS
 # ============================================================
 
 keymap_cache = {}
+_KEYMAP_CACHE_MAX = 256
+_cache_generation = 0  # part of every cache key; bumping it retires all older entries
+_LAST_CACHE_KEY = {"state": None, "key": None}  # raw prefs state -> get_cache_key() result
 last_keyconfig_fingerprint = None
+_relevant_cache = {}  # (km.as_pointer(), editor) -> is_relevant_keymap() result
 
 def _compute_keyconfig_fingerprint():
+    """
+    Per keymap: item count plus the last item's id and type. Blender numbers new items
+    from a per-keymap counter and appends them, so removing one binding and adding
+    another changes the fingerprint even when every count stays the same.
+    """
     try:
         wm = bpy.context.window_manager
         parts = []
@@ -144,16 +265,35 @@ def _compute_keyconfig_fingerprint():
             if not kc:
                 parts.append((kc_name, 0))
                 continue
-            cnt = 0
+            kms = []
             for km in kc.keymaps:
-                cnt += len(km.keymap_items)
-            parts.append((kc_name, cnt))
+                items = km.keymap_items
+                n = len(items)
+                if n:
+                    last = items[n - 1]
+                    kms.append((n, getattr(last, "id", None), last.type))
+                else:
+                    kms.append((0, None, None))
+            parts.append((kc_name, tuple(kms)))
         return tuple(parts)
     except Exception:
         return None
 
 def clear_keymap_cache():
-    keymap_cache.clear()
+    global _cache_generation
+    _cache_generation += 1
+    _LAST_CACHE_KEY["state"] = None
+    _KMI_SNAPSHOT["sig"] = None
+    _relevant_cache.clear()
+    _SCOPE_KEYMAPS["sig"] = None
+    _DISABLED_CACHE["sig"] = None
+    _DISABLED_CACHE["value"] = None
+    _DRAW_CACHE.clear()
+    _BOUND_KEYS["sig"] = None
+    _TYPE_INDEX["sig"] = None
+    get_keymap_conflicts.cache_clear()
+    _key_hits.cache_clear()
+    get_keymap_matches_in_editor.cache_clear()
 
 def is_cache_valid(_context):
     global last_keyconfig_fingerprint
@@ -165,164 +305,195 @@ def is_cache_valid(_context):
 
 def get_cache_key(editor, ctrl, shift, alt, cmd, screen_always_on, hide_modal, mode_str):
     return (editor, bool(ctrl), bool(shift), bool(alt), bool(cmd),
-            bool(screen_always_on), bool(hide_modal), mode_str)
+            bool(screen_always_on), bool(hide_modal), mode_str, _cache_generation)
 
 # ---- helpers (match panel) ----
 def _compact_rows(rows):
-    merged, order = {}, []
+    """
+    Merge duplicate bindings by (idname, value, key_modifier); first label/sig wins.
+    Keyconfig names keep first-seen order; an ordered set (dict) is only started
+    once a second row merges into the same key.
+    """
+    merged = {}
     for label_txt, sig, kc_names in rows:
-        k = (sig[1], sig[3], sig[4])  # (idname, value, key_mod)
-        if k not in merged:
-            merged[k] = (label_txt, sig, list(kc_names))
-            order.append(k)
+        k = (sig.id, sig.v, sig.km_mod)  # (idname, value, key_mod)
+        prev = merged.get(k)
+        if prev is None:
+            merged[k] = [label_txt, sig, kc_names, None]
         else:
-            prev_label, prev_sig, prev_kc = merged[k]
-            merged[k] = (prev_label, prev_sig, sorted(set(prev_kc) | set(kc_names)))
-    return [merged[k] for k in order]
+            kcs = prev[3]
+            if kcs is None:
+                kcs = prev[3] = dict.fromkeys(prev[2])
+            kcs.update(dict.fromkeys(kc_names))
+    return [(label_txt, sig, kc_names if kcs is None else list(kcs))
+            for label_txt, sig, kc_names, kcs in merged.values()]
+
+# Operator prefixes that may surface as Window/Screen globals, per 3D View mode / per editor
+_ALLOWED_VIEW3D = {
+    'OBJECT':       ('object.', 'mesh.', 'view3d.', 'pose.', 'armature.', 'wm.pme_user_pie_menu_call'),
+    'EDIT_MESH':    ('mesh.', 'view3d.', 'uv.', 'curve.', 'curves.', 'wm.pme_user_pie_menu_call'),
+    'EDIT_CURVE':   ('curve.', 'curves.', 'view3d.', 'wm.pme_user_pie_menu_call'),
+    'EDIT_SURFACE': ('curve.', 'view3d.', 'wm.pme_user_pie_menu_call'),
+    'SCULPT':       ('sculpt.', 'view3d.', 'wm.pme_user_pie_menu_call'),
+    'PAINT_VERTEX': ('paint.', 'view3d.', 'wm.pme_user_pie_menu_call'),
+    'PAINT_WEIGHT': ('paint.', 'view3d.', 'wm.pme_user_pie_menu_call'),
+    'PAINT_TEXTURE':('paint.', 'view3d.', 'wm.pme_user_pie_menu_call'),
+    'SCULPT_CURVES':('curves.', 'view3d.', 'wm.pme_user_pie_menu_call'),
+    'PARTICLE_EDIT':('particle.', 'view3d.', 'wm.pme_user_pie_menu_call'),
+    'POSE':         ('pose.', 'armature.', 'object.', 'view3d.', 'wm.pme_user_pie_menu_call'),
+    'EDIT_ARMATURE':('armature.', 'view3d.', 'wm.pme_user_pie_menu_call'),
+}
+_DEFAULT_VIEW3D = ('view3d.', 'object.', 'mesh.', 'wm.pme_user_pie_menu_call')
+_ALLOWED_FAMILY = {
+    'UV': ('uv.', 'image.', 'wm.pme_user_pie_menu_call'),
+    'IMAGE_EDITOR': ('image.', 'mask.', 'uv.', 'wm.pme_user_pie_menu_call'),
+    'GRAPH_EDITOR': ('graph.', 'anim.', 'wm.pme_user_pie_menu_call'),
+    'DOPESHEET_EDITOR': ('anim.', 'action.', 'wm.pme_user_pie_menu_call'),
+    'NLA_EDITOR': ('nla.', 'wm.pme_user_pie_menu_call'),
+    'SEQUENCE_EDITOR': ('sequencer.', 'wm.pme_user_pie_menu_call'),
+    'NODE_EDITOR': ('node.', 'wm.pme_user_pie_menu_call'),
+    'CLIP_EDITOR': ('clip.', 'wm.pme_user_pie_menu_call'),
+    'OUTLINER': ('outliner.', 'wm.pme_user_pie_menu_call'),
+    'TEXT_EDITOR': ('text.', 'wm.pme_user_pie_menu_call'),
+    'FILE_BROWSER': ('file.', 'wm.pme_user_pie_menu_call'),
+}
+_DEFAULT_FAMILY = ('wm.pme_user_pie_menu_call',)
 
-def _only_press(rows):
-    return [r for r in rows if r[1][3] == 'PRESS']
+def _prefix_bit(text):
+    # Every allowed prefix is at least 3 chars, so a match implies equal 3-char heads
+    return 1 << (hash(text[:3]) & 63)
 
-def _allow_global_for_editor(opid_lc, editor_id, mode_str):
+def _prefix_rule(prefixes):
+    """
+    (match, mask): match is one anchored regex over all prefixes; the mask ORs each
+    prefix's head bit for a one-AND reject test before the regex runs.
+    """
+    mask = 0
+    for pfx in prefixes:
+        mask |= _prefix_bit(pfx)
+    match = re.compile("(?:" + "|".join(map(re.escape, prefixes)) + ")").match
+    return match, mask
+
+_VIEW3D_RULES = {mode: _prefix_rule(p) for mode, p in _ALLOWED_VIEW3D.items()}
+_DEFAULT_VIEW3D_RULE = _prefix_rule(_DEFAULT_VIEW3D)
+_FAMILY_RULES = {editor: _prefix_rule(p) for editor, p in _ALLOWED_FAMILY.items()}
+_DEFAULT_FAMILY_RULE = _prefix_rule(_DEFAULT_FAMILY)
+
+def _global_rule(editor_id, mode_str):
+    """(match, mask) for the editor, or for the 3D View's current mode."""
     if editor_id == 'VIEW_3D':
-        allowed_by_mode = {
-            'OBJECT':       ('object.', 'mesh.', 'view3d.', 'pose.', 'armature.', 'wm.pme_user_pie_menu_call'),
-            'EDIT_MESH':    ('mesh.', 'view3d.', 'uv.', 'curve.', 'curves.', 'wm.pme_user_pie_menu_call'),
-            'EDIT_CURVE':   ('curve.', 'curves.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-            'EDIT_SURFACE': ('curve.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-            'SCULPT':       ('sculpt.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-            'PAINT_VERTEX': ('paint.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-            'PAINT_WEIGHT': ('paint.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-            'PAINT_TEXTURE':('paint.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-            'SCULPT_CURVES':('curves.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-            'PARTICLE_EDIT':('particle.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-            'POSE':         ('pose.', 'armature.', 'object.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-            'EDIT_ARMATURE':('armature.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-        }
-        allowed = allowed_by_mode.get(mode_str, ('view3d.', 'object.', 'mesh.', 'wm.pme_user_pie_menu_call'))
-        return opid_lc.startswith(allowed) or (opid_lc == 'wm.pme_user_pie_menu_call')
-    if editor_id == 'UV':
-        return opid_lc.startswith(('uv.', 'image.', 'wm.pme_user_pie_menu_call'))
-    if editor_id == 'IMAGE_EDITOR':
-        return opid_lc.startswith(('image.', 'mask.', 'uv.', 'wm.pme_user_pie_menu_call'))
-    family = {
-        'GRAPH_EDITOR': ('graph.', 'anim.', 'wm.pme_user_pie_menu_call'),
-        'DOPESHEET_EDITOR': ('anim.', 'action.', 'wm.pme_user_pie_menu_call'),
-        'NLA_EDITOR': ('nla.', 'wm.pme_user_pie_menu_call'),
-        'SEQUENCE_EDITOR': ('sequencer.', 'wm.pme_user_pie_menu_call'),
-        'NODE_EDITOR': ('node.', 'wm.pme_user_pie_menu_call'),
-        'CLIP_EDITOR': ('clip.', 'wm.pme_user_pie_menu_call'),
-        'OUTLINER': ('outliner.', 'wm.pme_user_pie_menu_call'),
-        'TEXT_EDITOR': ('text.', 'wm.pme_user_pie_menu_call'),
-        'FILE_BROWSER': ('file.', 'wm.pme_user_pie_menu_call'),
-    }.get(editor_id, ('wm.pme_user_pie_menu_call',))
-    return opid_lc.startswith(family) or (opid_lc == 'wm.pme_user_pie_menu_call')
+        return _VIEW3D_RULES.get(mode_str, _DEFAULT_VIEW3D_RULE)
+    return _FAMILY_RULES.get(editor_id, _DEFAULT_FAMILY_RULE)
+
+def _allow_global_for_editor(opid_lc, editor_id, mode_str, rule=None):
+    # Every prefix tuple includes the PME pie-menu operator, so the pattern covers it
+    match, mask = rule or _global_rule(editor_id, mode_str)
+    if not _prefix_bit(opid_lc) & mask:
+        return False
+    return match(opid_lc) is not None
 
 def _filter_global_rows_for_context(rows, editor_id, mode_str):
+    rule = _global_rule(editor_id, mode_str)  # resolved once for all rows
     out = []
     for label_txt, sig, kc_names in rows:
-        opid_lc = (sig[1] or '').lower()
-        if _allow_global_for_editor(opid_lc, editor_id, mode_str):
+        opid_lc = _lc(sig.id)
+        if _allow_global_for_editor(opid_lc, editor_id, mode_str, rule):
             out.append((label_txt, sig, kc_names))
     return out
 
-# Rows for the merged "Assigned in current context" (editor PRESS + filtered global PRESS)
-def _rows_for_assigned_context(context, key_label):
-    prefs = context.scene.keymap_checker
-    mode_str = getattr(context, "mode", "OBJECT") or "OBJECT"
+# Keymaps the highlight sweep visits, per (editor, screen_always_on, hide_modal); reset with the keyconfig version
+_SCOPE_KEYMAPS = {"sig": None, "lists": {}}
+
+def _scope_keymaps(editor, screen_always_on, hide_modal):
+    """[(km, in_global)] for the relevant editor keymaps (plus Window/Screen when screen_always_on)."""
+    version = _keyconfig_version()
+    if _SCOPE_KEYMAPS["sig"] != version:
+        _SCOPE_KEYMAPS["sig"] = version
+        _SCOPE_KEYMAPS["lists"] = {}
+    key = (editor, bool(screen_always_on), bool(hide_modal))
+    kms = _SCOPE_KEYMAPS["lists"].get(key)
+    if kms is None:
+        kms = []
+        for kc in _iter_all_keyconfigs():
+            for km in kc.keymaps:
+                if hide_modal and km.is_modal:
+                    continue
+                in_global = screen_always_on and (km.space_type or 'EMPTY') in {'EMPTY', 'SCREEN'}
+                if in_global or is_relevant_keymap(km, editor):
+                    kms.append((km, in_global))
+        _SCOPE_KEYMAPS["lists"][key] = kms
+    return kms
 
-    ed = _only_press(get_keymap_matches_in_editor(
-        key_label, prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd, hide_modal=prefs.hide_modal
-    ))
-    ed = _compact_rows(ed)
+def _sweep_highlights(editor, ctrl, shift, alt, cmd, screen_always_on, hide_modal):
+    """
+    Frozenset of highlighted keyboard key ids, from ONE pass over all keymap items.
+    A key is highlighted when the panel would list a PRESS row for it: an editor match,
+    or (with screen_always_on) any Window/Screen match. Only existence matters, so items
+    for already-lit keys are skipped and no row labels are ever formatted.
+    """
+    disabled_bindings = _collect_disabled_binding_sigs(hide_modal)
+    snapshot = _kmi_snapshot()
+    accept_mods = _accepted_mods(ctrl, shift, alt, cmd)
+    used = set()
+    for km, in_global in _scope_keymaps(editor, screen_always_on, hide_modal):
+        by_mods = _press_items(snapshot, km)
+        for want in accept_mods:
+            for kmi, labels, is_uv in by_mods.get(want, ()):
+                if used.issuperset(labels):
+                    continue
+                if disabled_bindings and _full_binding_sig(km, kmi) in disabled_bindings:
+                    continue
+                if editor == 'UV' and not in_global and not is_uv:
+                    continue
+                used.update(labels)
+                if len(used) == len(_ALL_KEYS):
+                    # Every key is already lit; nothing left to find
+                    return frozenset(used)
 
-    merged = list(ed)
-    if prefs.screen_always_on:
-        gl = _only_press(get_global_matches(
-            key_label, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd, hide_modal=prefs.hide_modal
-        ))
-        gl = _compact_rows(gl)
-        gl = _filter_global_rows_for_context(gl, prefs.editor, mode_str)  # keep merged view clean
-        merged.extend(gl)
-        merged = _compact_rows(merged)
-    return merged
-
-# Rows for the visible "In global scopes" section — RAW globals (PRESS only), NO editor/mode filter
-def _rows_for_global_scopes_section(context, key_label):
-    prefs = context.scene.keymap_checker
-    if not prefs.screen_always_on:
-        return []
-    gl = _only_press(get_global_matches(
-        key_label, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd, hide_modal=prefs.hide_modal
-    ))
-    gl = _compact_rows(gl)
-    return gl
+    return frozenset(used)
 
-def populate_keymap_cache(context):
-    global keymap_cache
+def _current_cache_key(context):
     prefs = context.scene.keymap_checker
     mode_str = getattr(context, "mode", "OBJECT") or "OBJECT"
-    cache_key = get_cache_key(
+    state = (
         prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
-        prefs.screen_always_on, prefs.hide_modal, mode_str
+        prefs.screen_always_on, prefs.hide_modal, mode_str, _cache_generation
     )
+    if state != _LAST_CACHE_KEY["state"]:
+        _LAST_CACHE_KEY["state"] = state
+        _LAST_CACHE_KEY["key"] = get_cache_key(*state[:-1])
+    return _LAST_CACHE_KEY["key"]
+
+def populate_keymap_cache(context, cache_key=None):
+    if cache_key is None:
+        cache_key = _current_cache_key(context)
     if cache_key in keymap_cache:
         return keymap_cache[cache_key]
 
-    cache = {}
-
-    def _highlight_for(label):
-        # Highlight if either list the user can see has rows.
-        if _rows_for_assigned_context(context, label):
-            return True
-        if _rows_for_global_scopes_section(context, label):
-            return True
-        return False
-
-    # QWERTY
-    for row_keys in qwerty_keys:
-        for k in row_keys:
-            cache[k] = _highlight_for(k)
-
-    # Cursor/navigation
-    for row_keys in cursor_keys:
-        for k in row_keys:
-            if k != ' ':
-                cache[k] = _highlight_for(k)
-
-    # Numpad
-    for row_keys in numpad_keys:
-        for k in row_keys:
-            if k == ' ':
-                continue
-            key_id = (
-                f"NUMPAD_{k}" if k in '0123456789' else
-                "NUMPAD_PERIOD" if k == '.' else
-                "NUMPAD_SLASH"  if k == '/' else
-                "NUMPAD_ASTERIX" if k == '*' else
-                "NUMPAD_MINUS"  if k == '-' else
-                "NUMPAD_PLUS"   if k == '+' else
-                "NUMPAD_ENTER"  if k == 'ENTER' else
-                "NUMPAD_EQUALS" if k == '=' else k
-            )
-            cache[key_id] = _highlight_for(key_id)
+    prefs = context.scene.keymap_checker
+    cache = _sweep_highlights(
+        prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
+        prefs.screen_always_on, prefs.hide_modal
+    )
 
+    if len(keymap_cache) >= _KEYMAP_CACHE_MAX:
+        # Mostly entries from retired generations; drop them all at once
+        keymap_cache.clear()
     keymap_cache[cache_key] = cache
     return cache
 
-def is_key_used_cached(context, key_label):
+def used_keys_cached(context):
+    """Frozenset of highlighted key ids for the current panel state; validated once per call."""
     if not is_cache_valid(context):
         clear_keymap_cache()
-    prefs = context.scene.keymap_checker
-    mode_str = getattr(context, "mode", "OBJECT") or "OBJECT"
-    cache_key = get_cache_key(
-        prefs.editor, prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
-        prefs.screen_always_on, prefs.hide_modal, mode_str
-    )
+    cache_key = _current_cache_key(context)
     cache = keymap_cache.get(cache_key)
     if cache is None:
-        cache = populate_keymap_cache(context)
-    return cache.get(key_label, False)
+        cache = populate_keymap_cache(context, cache_key)
+    return cache
+
+def is_key_used_cached(context, key_label):
+    return key_label in used_keys_cached(context)
 
 
 # --- Original Helper Functions (mostly unchanged) ---
@@ -335,7 +506,15 @@ def is_relevant_keymap(km, editor):
       • UV Editor: only IMAGE_EDITOR keymaps that are UV-specific (by name).
       • Non‑UV editors: block UV‑named maps.
       • Global scopes (SCREEN/EMPTY) are not treated as 'current editor'.
+    Decisions are cached per (keymap pointer, editor) until clear_keymap_cache().
     """
+    key = (km.as_pointer(), editor)
+    hit = _relevant_cache.get(key)
+    if hit is None:
+        hit = _relevant_cache[key] = _is_relevant_keymap(km, editor)
+    return hit
+
+def _is_relevant_keymap(km, editor):
     space = km.space_type or 'EMPTY'
     name = (km.name or "").lower()
 
@@ -355,111 +534,228 @@ def is_relevant_keymap(km, editor):
     # Otherwise not relevant for the current editor
     return False
 
-def _collect_disabled_sigs():
-    disabled = set()
-    wm = bpy.context.window_manager
-    for kc in (getattr(wm.keyconfigs, "user", None),
-               getattr(wm.keyconfigs, "active", None)):
-        if not kc:
-            continue
-        for km in kc.keymaps:
-            for kmi in km.keymap_items:
-                if not getattr(kmi, "active", True):
-                    disabled.add(_sig_for_kmi(km, kmi))
-    return disabled
+def normalize_key_types(label: str):
+    """Blender event types for a keyboard key id, as a shared frozenset for O(1) kmi.type tests."""
+    types = _KEY_TYPES.get(label)
+    if types is None:
+        # Only ids outside the drawn layouts get here
+        types = frozenset(_event_types_for(label))
+    return types
+
+# Key ids whose Blender event type differs from the id itself
+_EVENT_TYPES = {
+    "UP": ("UP_ARROW",),
+    "DOWN": ("DOWN_ARROW",),
+    "LEFT": ("LEFT_ARROW",),
+    "RIGHT": ("RIGHT_ARROW",),
+    "TAB": ("TAB",),
+    "ESC": ("ESC",),
+    "SPACE": ("SPACE",),
+    "BACK_SPACE": ("BACK_SPACE",),
+    "RETURN": ("RET",),
+    "ENTER": ("RET",),
+    "DELETE": ("DEL",),
+    "INSERT": ("INSERT",),
+    "HOME": ("HOME",),
+    "END": ("END",),
+    "PAGE_UP": ("PAGE_UP",),
+    "PAGE_DOWN": ("PAGE_DOWN",),
+    "0": ("ZERO",), "1": ("ONE",), "2": ("TWO",), "3": ("THREE",), "4": ("FOUR",),
+    "5": ("FIVE",), "6": ("SIX",), "7": ("SEVEN",), "8": ("EIGHT",), "9": ("NINE",),
+    "`": ("ACCENT_GRAVE", "GRAVE"),
+    "-": ("MINUS",),
+    "=": ("EQUAL",),
+    "[": ("LEFT_BRACKET",),
+    "]": ("RIGHT_BRACKET",),
+    "\\": ("BACK_SLASH",),
+    ";": ("SEMI_COLON",),
+    "'": ("QUOTE",),
+    ",": ("COMMA",),
+    ".": ("PERIOD",),
+    "/": ("SLASH",),
+    "+": ("PLUS",),
+}
 
+def _event_types_for(label: str):
+    # F-keys, letters and NUMPAD_* ids are already Blender event types
+    return _EVENT_TYPES.get(label, (label,))
 
-def normalize_key_types(label: str):
-    if label.startswith("F") and label[1:].isdigit():
-        return [label]
-    if label in {"UP", "DOWN", "LEFT", "RIGHT"}:
-        return [f"{label}_ARROW"]
-    special = {
-        "TAB": ["TAB"],
-        "ESC": ["ESC"],
-        "SPACE": ["SPACE"],
-        "BACK_SPACE": ["BACK_SPACE"],
-        "RETURN": ["RET"],
-        "ENTER": ["RET"],
-        "DELETE": ["DEL"],
-        "INSERT": ["INSERT"],
-        "HOME": ["HOME"],
-        "END": ["END"],
-        "PAGE_UP": ["PAGE_UP"],
-        "PAGE_DOWN": ["PAGE_DOWN"],
-    }
-    if label in special:
-        return special[label]
-    if label in {"0","1","2","3","4","5","6","7","8","9"}:
-        num_map = {
-            "0": "ZERO", "1": "ONE", "2": "TWO", "3": "THREE", "4": "FOUR",
-            "5": "FIVE", "6": "SIX", "7": "SEVEN", "8": "EIGHT", "9": "NINE",
-        }
-        return [num_map[label]]
-    punct = {
-        "`": ["ACCENT_GRAVE", "GRAVE"],
-        "-": ["MINUS"],
-        "=": ["EQUAL"],
-        "[": ["LEFT_BRACKET"],
-        "]": ["RIGHT_BRACKET"],
-        "\\": ["BACK_SLASH"],
-        ";": ["SEMI_COLON"],
-        "'": ["QUOTE"],
-        ",": ["COMMA"],
-        ".": ["PERIOD"],
-        "/": ["SLASH"],
-        "+": ["PLUS"],
-    }
-    if label in punct:
-        return punct[label]
-    if label.startswith("NUMPAD_"):
-        return [label]
-    return [label]
+# Every layout key's event types, resolved at import; the layouts are fixed
+_KEY_TYPES = {k: frozenset(_event_types_for(k)) for k in _ALL_KEYS}
+
+# Blender event type -> keyboard key ids it lights up (e.g. 'RET' -> RETURN and ENTER)
+KEY_TYPE_TO_LABELS = {}
+for _k in _ALL_KEYS:
+    for _t in _KEY_TYPES[_k]:
+        KEY_TYPE_TO_LABELS[_t] = KEY_TYPE_TO_LABELS.get(_t, ()) + (_k,)
+del _k, _t
 
 def _iter_all_keyconfigs():
-    wm = bpy.context.window_manager
-    kcs = []
-    for kc in (
-        getattr(wm.keyconfigs, "default", None),
-        getattr(wm.keyconfigs, "user", None),
-        getattr(wm.keyconfigs, "addon", None),
-        getattr(wm.keyconfigs, "active", None),
-    ):
-        if kc and kc not in kcs:
-            kcs.append(kc)
-            _debug_print(f"Keyconfig: {kc.name}")
+    """Default, user, add-on and active keyconfigs first, then any others; each exactly once."""
+    keyconfigs = bpy.context.window_manager.keyconfigs
+    candidates = tuple(getattr(keyconfigs, attr, None) for attr in ("default", "user", "addon", "active"))
     try:
-        for kc in wm.keyconfigs:
-            if kc and kc not in kcs:
-                kcs.append(kc)
-                _debug_print(f"Keyconfig: {kc.name}")
+        candidates += tuple(keyconfigs)
     except Exception as e:
-        _debug_print(f"Error iterating keyconfigs: {e}")
-    for kc in kcs:
-        yield kc
+        if DEBUG_KEYMAPS:
+            _debug_print(f"Error iterating keyconfigs: {e}")
+
+    seen = set()  # as_pointer() values: RNA wrappers differ per access (so id() can't dedupe), the pointer does not
+    for kc in candidates:
+        if kc:
+            ptr = kc.as_pointer()
+            if ptr not in seen:
+                seen.add(ptr)
+                if DEBUG_KEYMAPS:
+                    _debug_print(f"Keyconfig: {kc.name}")
+                yield kc
+
+# "uv " as a whole word at the start of, or inside, an item's display name
+_UV_NAME_RE = re.compile(r"(?:^| )uv ", re.IGNORECASE)
+
+@functools.lru_cache(maxsize=1024)
+def _is_uv_binding(idname, name):
+    return 'uv.' in _lc(idname) or _UV_NAME_RE.search(name or "") is not None
+
+_ANY_MODS = 1 << 4  # snapshot modifier state of an 'any' item; outside the 4-bit masks
+
+def _mod_bits(ctrl, shift, alt, cmd):
+    """Modifier state as a 4-bit int (ctrl=1, shift=2, alt=4, cmd/oskey=8)."""
+    return bool(ctrl) | bool(shift) << 1 | bool(alt) << 2 | bool(cmd) << 3
+
+def _accepted_mods(ctrl, shift, alt, cmd):
+    """Snapshot modifier states that match the wanted modifiers ('any' items only match none)."""
+    want = _mod_bits(ctrl, shift, alt, cmd)
+    return frozenset((want, _ANY_MODS)) if not want else frozenset((want,))
+
+# Plain-Python copy of each keymap's items, so the scans read RNA once per keyconfig version
+_KMI_SNAPSHOT = {"sig": None, "items": {}, "press": {}}
+
+def _kmi_snapshot():
+    """km.as_pointer() -> [(kmi, type, active, value, mods, idname, name, key_modifier)], reset when _keyconfig_version() changes."""
+    sig = _keyconfig_version()
+    if _KMI_SNAPSHOT["sig"] != sig:
+        _KMI_SNAPSHOT["sig"] = sig
+        _KMI_SNAPSHOT["items"] = {}
+        _KMI_SNAPSHOT["press"] = {}
+    return _KMI_SNAPSHOT["items"]
+
+# Key ids that have at least one binding in any keyconfig, reset with the keyconfig version
+_BOUND_KEYS = {"sig": None, "keys": frozenset()}
+
+def _bound_key_ids():
+    """Unbound keys cannot produce rows for any editor or modifier combination."""
+    sig = _keyconfig_version()
+    if _BOUND_KEYS["sig"] != sig:
+        bound = set()
+        for k_type in _items_by_type():
+            bound.update(KEY_TYPE_TO_LABELS.get(k_type, ()))
+        _BOUND_KEYS["sig"] = sig
+        _BOUND_KEYS["keys"] = frozenset(bound)
+    return _BOUND_KEYS["keys"]
+
+def _km_items(snapshot, km):
+    ptr = km.as_pointer()
+    rows = snapshot.get(ptr)
+    if rows is None:
+        rows = snapshot[ptr] = [
+            (kmi, kmi.type, kmi.active, kmi.value,
+             _ANY_MODS if kmi.any else _mod_bits(kmi.ctrl, kmi.shift, kmi.alt, kmi.oskey),
+             kmi.idname or "", kmi.name or "", kmi.key_modifier)
+            for kmi in km.keymap_items
+        ]
+    return rows
+
+def _press_items(snapshot, km):
+    """
+    km's active PRESS items on keyboard keys, grouped as {mods: [(kmi, key ids, is_uv)]}.
+    Built once per keymap per snapshot, so the highlight sweep only visits the
+    groups for the wanted modifiers and skips every other filter test.
+    """
+    press = _KMI_SNAPSHOT["press"]
+    ptr = km.as_pointer()
+    groups = press.get(ptr)
+    if groups is None:
+        groups = press[ptr] = {}
+        for kmi, k_type, active, value, mods, idname, name, _key_mod in _km_items(snapshot, km):
+            labels = KEY_TYPE_TO_LABELS.get(k_type)
+            if labels and active and value == 'PRESS':
+                groups.setdefault(mods, []).append((kmi, labels, _is_uv_binding(idname, name)))
+    return groups
+
+# Event type -> every snapshot item of that type across all keyconfigs, reset with the keyconfig version
+_TYPE_INDEX = {"sig": None, "by_type": {}}
+
+def _items_by_type():
+    """{kmi.type: [(pos, kc_name, km, km_name, km_is_modal, snapshot row)]}; pos keeps walk order."""
+    sig = _keyconfig_version()
+    if _TYPE_INDEX["sig"] != sig:
+        snapshot = _kmi_snapshot()
+        by_type = {}
+        pos = 0
+        for kc in _iter_all_keyconfigs():
+            kc_name = kc.name
+            for km in kc.keymaps:
+                km_name = km.name or ""
+                is_modal = km.is_modal
+                for row in _km_items(snapshot, km):
+                    by_type.setdefault(row[1], []).append((pos, kc_name, km, km_name, is_modal, row))
+                    pos += 1
+        _TYPE_INDEX["sig"] = sig
+        _TYPE_INDEX["by_type"] = by_type
+    return _TYPE_INDEX["by_type"]
+
+class Sig:
+    """Display-row signature (keymap, idname, name, value, key_modifier); hashed once."""
+    __slots__ = ("km", "id", "n", "v", "km_mod", "_h")
+
+    def __init__(self, km, id, n, v, km_mod):
+        self.km = km
+        self.id = id
+        self.n = n
+        self.v = v
+        self.km_mod = km_mod
+        self._h = None
+
+    def __hash__(self):
+        h = self._h
+        if h is None:
+            h = self._h = hash((self.km, self.id, self.n, self.v, self.km_mod))
+        return h
+
+    def __eq__(self, o):
+        if self is o:
+            return True
+        if not isinstance(o, Sig):
+            return NotImplemented
+        return (self.km == o.km and self.id == o.id and self.n == o.n
+                and self.v == o.v and self.km_mod == o.km_mod)
 
-def _modifiers_match(kmi, ctrl, shift, alt, cmd):
-    if getattr(kmi, "any", False):
-        return not (ctrl or shift or alt or cmd)
-    return (
-        bool(kmi.ctrl)  == bool(ctrl)  and
-        bool(kmi.shift) == bool(shift) and
-        bool(kmi.alt)   == bool(alt)   and
-        bool(kmi.oskey) == bool(cmd)
-    )
+    def __repr__(self):
+        return f"Sig({self.km!r}, {self.id!r}, {self.n!r}, {self.v!r}, {self.km_mod!r})"
 
 def _sig_for_kmi(km, kmi):
-    return (
+    return Sig(
         km.name or "",
         kmi.idname or "",
         kmi.name or "",
-        getattr(kmi, "value", "PRESS"),
-        getattr(kmi, "key_modifier", "NONE"),
+        kmi.value,
+        kmi.key_modifier,
     )
 
+def _apply_sig(op, sig, kc_name):
+    """Copy a row signature onto an operator that locates a keymap item."""
+    op.kc_name = kc_name
+    op.km_name = sig.km
+    op.kmi_idname = sig.id
+    op.kmi_name = sig.n
+    op.kmi_value = sig.v
+    op.kmi_key_modifier = sig.km_mod
+
 def get_system_conflicts(key_label, editor, ctrl, shift, alt, cmd, hide_modal=False):
-    def _scan(scope):
-        return get_keymap_matches_in_editor(key_label, scope, ctrl, shift, alt, cmd, hide_modal=hide_modal)
+    def _scan(scope, build_labels=True):
+        return get_keymap_matches_in_editor(key_label, scope, ctrl, shift, alt, cmd,
+                                            hide_modal=hide_modal, build_labels=build_labels)
 
     sys_labels = []
     for sys_scope in ('SCREEN', 'EMPTY'):
@@ -467,7 +763,8 @@ def get_system_conflicts(key_label, editor, ctrl, shift, alt, cmd, hide_modal=Fa
     if not sys_labels:
         return []
 
-    ed_labels = _scan(editor)
+    # Only existence matters for the editor side
+    ed_labels = _scan(editor, build_labels=False)
     if not ed_labels:
         return []
 
@@ -479,54 +776,82 @@ def get_keymap_matches(key_label, editor, ctrl, shift, alt, cmd, screen_always_o
     """
     return get_keymap_matches_in_editor(key_label, editor, ctrl, shift, alt, cmd, hide_modal=hide_modal)
 
-def get_global_matches(key_label, ctrl, shift, alt, cmd, hide_modal=False):
+_POS = operator.itemgetter(0)
+
+@functools.lru_cache(maxsize=64)
+def _key_hits(key_label, ctrl, shift, alt, cmd, hide_modal=False):
     """
-    Return merged rows from Window/Screen (EMPTY + SCREEN), deduped by signature.
-    Used only for the separate 'Global scopes' section.
+    Every enabled binding of key_label under these modifiers, as (kc_name, km, kmi, value, sig)
+    in keyconfig order, built from the item snapshot without further RNA reads. The editor, global and other-editor row builders all filter this
+    short list instead of walking the keymap tree again.
+    Memoized per argument tuple; clear_keymap_cache() resets it.
     """
-    key_types = normalize_key_types(key_label)
-    disabled_bindings = _collect_disabled_binding_sigs()
-
-    merged = {}
-    order = []
-    for kc in _iter_all_keyconfigs():
-        kc_name = kc.name
-        for km in kc.keymaps:
-            if hide_modal and getattr(km, "is_modal", False):
-                continue
-            space = km.space_type or 'EMPTY'
-            if space not in {'EMPTY', 'SCREEN'}:
-                continue
-
-            for kmi in km.keymap_items:
-                if not kmi.active:
-                    continue
-                if kmi.type not in key_types:
-                    continue
-                if not _modifiers_match(kmi, ctrl, shift, alt, cmd):
-                    continue
-                if _full_binding_sig(km, kmi) in disabled_bindings:
-                    continue
-
-                sig = _sig_for_kmi(km, kmi)
-                if sig not in merged:
-                    merged[sig] = (km, kmi, {kc_name})
-                    order.append(sig)
-                else:
-                    merged[sig][2].add(kc_name)
+    disabled_bindings = _collect_disabled_binding_sigs(hide_modal)
+    accept_mods = _accepted_mods(ctrl, shift, alt, cmd)
+
+    # Only items of the key's own event types are visited, via the per-version type index
+    by_type = _items_by_type()
+    candidates = []
+    for k_type in normalize_key_types(key_label):
+        candidates.extend(by_type.get(k_type, ()))
+    candidates.sort(key=_POS)  # back to keyconfig/keymap/item order when several types match
+
+    hits = []
+    for _pos, kc_name, km, km_name, is_modal, row in candidates:
+        if hide_modal and is_modal:
+            continue
+        kmi, _type, active, value, mods, idname, name, key_mod = row
+        if not active:
+            continue
+        if mods not in accept_mods:
+            continue
+        if disabled_bindings and _full_binding_sig(km, kmi) in disabled_bindings:
+            continue
+        hits.append((kc_name, km, kmi, value, Sig(km_name, idname, name, value, key_mod)))
+    return tuple(hits)
+
+def _rows_from_hits(hits, compact=False, build_labels=True):
+    """Merge hits into display rows by signature, or by (idname, value, key_modifier) when compact."""
+    merged = {}  # insertion-ordered: first hit per key fixes the row position
+    for kc_name, km, kmi, _value, sig in hits:
+        # compact merges by (idname, value, key_modifier); the first sig keeps the label
+        key = (sig.id, sig.v, sig.km_mod) if compact else sig
+        hit = merged.get(key)
+        if hit is None:
+            # dicts as ordered sets: names stay in keyconfig walk order, no sorting needed
+            merged[key] = (km, kmi, sig, {kc_name: None}, {kc_name: None})
+        else:
+            if hit[2] == sig:
+                hit[3][kc_name] = None
+            hit[4][kc_name] = None
 
     out = []
-    for sig in order:
-        km, kmi, kc_names = merged[sig]
-        label = _format_kmi_label(", ".join(sorted(kc_names)), km, kmi)
-        out.append((label, sig, sorted(kc_names)))
+    for km, kmi, sig, label_kcs, kc_names in merged.values():
+        label = _format_kmi_label(", ".join(label_kcs), km, kmi) if build_labels else ""
+        out.append((label, sig, list(kc_names)))
     return out
 
+def get_global_matches(key_label, ctrl, shift, alt, cmd, hide_modal=False,
+                       press_only=False, compact=False, build_labels=True):
+    """
+    Return merged rows from Window/Screen (EMPTY + SCREEN), deduped by signature.
+    Used only for the separate 'Global scopes' section.
+    press_only: drop non-PRESS rows. compact: same rows as passing the result through _compact_rows.
+    build_labels=False leaves every label "" for callers that only test for rows.
+    """
+    hits = []
+    for hit in _key_hits(key_label, ctrl, shift, alt, cmd, hide_modal):
+        if press_only and hit[3] != 'PRESS':
+            continue
+        if (hit[1].space_type or 'EMPTY') in {'EMPTY', 'SCREEN'}:
+            hits.append(hit)
+    return _rows_from_hits(hits, compact, build_labels)
+
 def _format_kmi_label(kc_names, km, kmi):
     space = (km.space_type or 'EMPTY')
     editor_display = editor_map.get(space, km.name or space)
-    op = (getattr(kmi, "idname", "") or "").strip()
-    disp = (getattr(kmi, "name", "") or "").strip()
+    op = (kmi.idname or "").strip()
+    disp = (kmi.name or "").strip()
 
     if getattr(km, "is_modal", False) and not op:
         event = (
@@ -545,12 +870,12 @@ def _format_kmi_label(kc_names, km, kmi):
             label += f" ({disp})"
 
     extras = []
-    if getattr(kmi, "any", False):
+    if kmi.any:
         extras.append("any-mod")
-    kmv = getattr(kmi, "value", None)
+    kmv = kmi.value
     if kmv and kmv != 'PRESS':
         extras.append(f"value:{kmv}")
-    key_mod = getattr(kmi, "key_modifier", 'NONE')
+    key_mod = kmi.key_modifier
     if key_mod not in (None, 'NONE', 'UNKNOWN', ''):
         extras.append(f"key_mod:{key_mod}")
     if extras:
@@ -560,55 +885,30 @@ def _format_kmi_label(kc_names, km, kmi):
 def _global_editors_for_merge():
     return ('SCREEN', 'EMPTY')
 
-def get_keymap_matches_in_editor(key_label, editor, ctrl, shift, alt, cmd, hide_modal=False):
+@functools.lru_cache(maxsize=64)
+def get_keymap_matches_in_editor(key_label, editor, ctrl, shift, alt, cmd, hide_modal=False,
+                                 press_only=False, compact=False, build_labels=True):
     """
     Return rows ONLY from the selected editor (no Window/Screen merge).
     UV mode is extra‑strict: even within IMAGE_EDITOR, accept only UV operators.
+    press_only: drop non-PRESS rows. compact: same rows as passing the result through _compact_rows.
+    build_labels=False leaves every label "" for callers that only test for rows.
+    Memoized per argument tuple; clear_keymap_cache() resets it. Callers must not mutate the list.
     """
-    key_types = normalize_key_types(key_label)
-    disabled_bindings = _collect_disabled_binding_sigs()
-
-    merged = {}
-    order = []
-    for kc in _iter_all_keyconfigs():
-        kc_name = kc.name
-        for km in kc.keymaps:
-            if hide_modal and getattr(km, "is_modal", False):
-                continue
-            if not is_relevant_keymap(km, editor):
-                continue
-
-            for kmi in km.keymap_items:
-                if not kmi.active:
-                    continue
-                if kmi.type not in key_types:
-                    continue
-                if not _modifiers_match(kmi, ctrl, shift, alt, cmd):
-                    continue
-                if _full_binding_sig(km, kmi) in disabled_bindings:
-                    continue
-
-                # Extra UV strictness: only UV operators count when editor == 'UV'
-                if editor == 'UV':
-                    id_lc = (getattr(kmi, "idname", "") or "").lower()
-                    name_lc = (getattr(kmi, "name", "") or "").lower()
-                    if not ('uv.' in id_lc or name_lc.startswith('uv ') or ' uv ' in name_lc):
-                        continue
-
-                sig = _sig_for_kmi(km, kmi)
-                if sig not in merged:
-                    merged[sig] = (km, kmi, {kc_name})
-                    order.append(sig)
-                else:
-                    merged[sig][2].add(kc_name)
-
-    out = []
-    for sig in order:
-        km, kmi, kc_names = merged[sig]
-        label = _format_kmi_label(", ".join(sorted(kc_names)), km, kmi)
-        out.append((label, sig, sorted(kc_names)))
-    return out
+    hits = []
+    for hit in _key_hits(key_label, ctrl, shift, alt, cmd, hide_modal):
+        if press_only and hit[3] != 'PRESS':
+            continue
+        km = hit[1]
+        if not is_relevant_keymap(km, editor):
+            continue
+        # Extra UV strictness: only UV operators count when editor == 'UV'
+        if editor == 'UV' and not _is_uv_binding(hit[4].id, hit[4].n):
+            continue
+        hits.append(hit)
+    return _rows_from_hits(hits, compact, build_labels)
 
+@functools.lru_cache(maxsize=256)
 def get_keymap_conflicts(key_label, current_editor, ctrl, shift, alt, cmd,
                          screen_always_on=False, hide_modal=False):
     """
@@ -618,6 +918,7 @@ def get_keymap_conflicts(key_label, current_editor, ctrl, shift, alt, cmd,
       3) intra_editor_conflicts   -> editor_rows if there are 2+ distinct entries, else []
       4) editor_overlap_rows      -> subset of editor_rows whose (idname,value,key_mod) also exists in global
       5) global_overlap_rows      -> subset of global_rows whose (idname,value,key_mod) also exists in editor
+    Memoized per argument tuple; clear_keymap_cache() resets it. Callers must not mutate the lists.
     """
     # Current editor matches
     editor_rows = get_keymap_matches_in_editor(
@@ -629,29 +930,25 @@ def get_keymap_conflicts(key_label, current_editor, ctrl, shift, alt, cmd,
         key_label, ctrl, shift, alt, cmd, hide_modal=hide_modal
     )
     compact = {}
-    order = []
-    for label_txt, sig, kc_names in global_full:
-        # sig = (km.name, kmi.idname, kmi.name, value, key_modifier)
-        k = (sig[1], sig[3], sig[4])  # (idname, value, key_modifier)
-        if k not in compact:
-            compact[k] = (label_txt, sig, kc_names)
-            order.append(k)
-    global_rows = [compact[k] for k in order]
+    for row in global_full:
+        sig = row[1]  # Sig(km.name, kmi.idname, kmi.name, value, key_modifier)
+        compact.setdefault((sig.id, sig.v, sig.km_mod), row)  # first row per (idname, value, key_modifier) wins
+    global_rows = list(compact.values())
 
     # Intra‑editor conflict = multiple distinct entries inside the editor
     intra_editor_conflicts = editor_rows if len(editor_rows) > 1 else []
 
-    # Build overlap sets by operator signature (same binding on global & editor)
-    def sig3(row):  # (idname,value,key_modifier)
-        _sig = row[1]
-        return (_sig[1], _sig[3], _sig[4])
-
-    editor_sigset = {sig3(r) for r in editor_rows}
-    global_sigset = {sig3(r) for r in global_rows}
-    overlap = editor_sigset & global_sigset
-
-    editor_overlap_rows = [r for r in editor_rows if sig3(r) in overlap]
-    global_overlap_rows = [r for r in global_rows if sig3(r) in overlap]
+    # Overlap by operator signature (idname, value, key_modifier): same binding on global & editor.
+    # global_rows was compacted on exactly that key, so `compact` already indexes it.
+    overlap = set()
+    editor_overlap_rows = []
+    for r in editor_rows:
+        _sig = r[1]
+        k = (_sig.id, _sig.v, _sig.km_mod)
+        if k in compact:
+            overlap.add(k)
+            editor_overlap_rows.append(r)
+    global_overlap_rows = [row for k, row in compact.items() if k in overlap]
 
     return editor_rows, global_rows, intra_editor_conflicts, editor_overlap_rows, global_overlap_rows
 
@@ -668,19 +965,26 @@ class WM_OT_SelectKey(bpy.types.Operator):
         assigned = is_key_used_cached(context, self.key)
         if assigned:
             prefs.selected_key = self.key
-        for area in context.screen.areas:
-            if area.type == 'VIEW_3D':
-                for region in area.regions:
-                    if region.type == 'UI':
-                        region.tag_redraw()
+        # Invoked from the panel button, so the context region is the panel's
+        if context.region is not None:
+            context.region.tag_redraw()
+        else:
+            for area in context.screen.areas:
+                if area.type == 'VIEW_3D':
+                    for region in area.regions:
+                        if region.type == 'UI':
+                            region.tag_redraw()
         return {'FINISHED'}
 
+_DIGIT_WORDS = dict(zip("0123456789", ("Zero", "One", "Two", "Three", "Four",
+                                        "Five", "Six", "Seven", "Eight", "Nine")))
+
 def _keybinding_search_text(key_label: str, ctrl=False, shift=False, alt=False, cmd=False) -> str:
     mods = []
     if ctrl:  mods.append("Ctrl")
     if shift: mods.append("Shift")
     if alt:   mods.append("Alt")
-    if cmd and platform.system() == 'Darwin':
+    if cmd and IS_MAC:
         mods.append("Cmd")
 
     k = (key_label or "").upper()
@@ -708,9 +1012,8 @@ def _keybinding_search_text(key_label: str, ctrl=False, shift=False, alt=False,
         key_txt = "Backspace"
     elif k in {"DEL", "DELETE"}:
         key_txt = "Delete"
-    elif k in set("0123456789"):
-        words = ["Zero","One","Two","Three","Four","Five","Six","Seven","Eight","Nine"]
-        key_txt = words[int(k)]
+    elif k in _DIGIT_WORDS:
+        key_txt = _DIGIT_WORDS[k]
     elif k in {"`","-","=","[","]","\\",";","'",",",".","/","+"}:
         punct_map = {
             "`": "Accent Grave",
@@ -901,15 +1204,15 @@ class WM_OT_DisableKeymapItem(bpy.types.Operator):
             return {'CANCELLED'}
 
         kmi = None
+        want = Sig(
+            self.km_name,
+            self.kmi_idname,
+            self.kmi_name,
+            self.kmi_value,
+            self.kmi_key_modifier
+        )
         for item in km.keymap_items:
-            sig = _sig_for_kmi(km, item)
-            if sig == (
-                self.km_name,
-                self.kmi_idname,
-                self.kmi_name,
-                self.kmi_value,
-                self.kmi_key_modifier
-            ):
+            if _sig_for_kmi(km, item) == want:
                 kmi = item
                 break
 
@@ -933,6 +1236,74 @@ class WM_OT_DisableKeymapItem(bpy.types.Operator):
 # ---------------------------------------------
 # Panel
 # ---------------------------------------------
+DrawData = collections.namedtuple("DrawData", "conflicts merged_rows gl_rows_all other_rows other_omitted")
+_NO_DRAW_DATA = DrawData(((), (), (), (), ()), [], [], [], 0)
+_OTHER_ROWS_MAX = 200  # informational section; stop scanning editors past this many rows
+
+def _draw_data(prefs, mode_str):
+    """
+    Rows for the panel's details sections, memoized on every input they depend on so
+    redraws between key/modifier/toggle changes only walk the rows they render.
+    """
+    draw_sig = (
+        prefs.selected_key, prefs.editor,
+        prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
+        prefs.screen_always_on, prefs.hide_modal, mode_str,
+        # draw() validates the fingerprint first; it changes on any item add/remove
+        _keyconfig_version(), last_keyconfig_fingerprint,
+    )
+    data = _DRAW_CACHE.get(draw_sig)
+    if data is not None:
+        return data
+
+    # Conflicts (strict separation; no scope mixing), compacted before display
+    conflicts = tuple(_compact_rows(rows) for rows in get_keymap_conflicts(
+        prefs.selected_key, prefs.editor,
+        prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
+        screen_always_on=prefs.screen_always_on,
+        hide_modal=prefs.hide_modal
+    ))
+
+    # Assigned in current context: editor PRESS rows + filtered global PRESS rows
+    editor_only_rows = get_keymap_matches_in_editor(
+        prefs.selected_key, prefs.editor,
+        prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
+        hide_modal=prefs.hide_modal, press_only=True, compact=True
+    )
+
+    merged_rows = list(editor_only_rows)
+    gl_rows_all = []
+    if prefs.screen_always_on:
+        gl_all = get_global_matches(
+            prefs.selected_key,
+            prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
+            hide_modal=prefs.hide_modal, press_only=True, compact=True
+        )
+        # Same filtered rows back both the merged section and "In global scopes"
+        gl_rows_all = _filter_global_rows_for_context(gl_all, prefs.editor, mode_str)
+        merged_rows.extend(gl_rows_all)
+        merged_rows = _compact_rows(merged_rows)
+
+    # Other editors (informational, dedup + only PRESS)
+    other_rows = []
+    other_omitted = 0
+    others = [ed for ed in _NON_GLOBAL_EDITORS if ed != prefs.editor]
+    for i, ed_id in enumerate(others):
+        if len(other_rows) > _OTHER_ROWS_MAX:
+            other_omitted = len(others) - i
+            break
+        # PRESS filter runs *before* compacting, inside the scan
+        other_rows.extend(get_keymap_matches_in_editor(
+            prefs.selected_key, ed_id,
+            prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
+            hide_modal=prefs.hide_modal, press_only=True, compact=True
+        ))
+
+    if len(_DRAW_CACHE) >= _DRAW_CACHE_MAX:
+        _DRAW_CACHE.clear()
+    data = _DRAW_CACHE[draw_sig] = DrawData(conflicts, merged_rows, gl_rows_all, other_rows, other_omitted)
+    return data
+
 class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
     bl_label = "KeymapVisualizer"
     bl_idname = "VIEW3D_PT_keymap_visualizer"
@@ -944,68 +1315,6 @@ class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
         layout = self.layout
         prefs = context.scene.keymap_checker
 
-        # ---------- helpers ----------
-        def compact_rows(rows):
-            """Merge duplicate bindings by (idname, value, key_modifier)."""
-            merged = {}
-            order = []
-            for label_txt, sig, kc_names in rows:
-                k = (sig[1], sig[3], sig[4])  # (idname, value, key_mod)
-                if k not in merged:
-                    merged[k] = (label_txt, sig, list(kc_names))
-                    order.append(k)
-                else:
-                    prev_label, prev_sig, prev_kc = merged[k]
-                    merged[k] = (prev_label, prev_sig, sorted(set(prev_kc) | set(kc_names)))
-            return [merged[k] for k in order]
-
-        def only_press(rows):
-            """Keep only value==PRESS to avoid DOUBLE_CLICK/CLICK/RELEASE noise."""
-            return [r for r in rows if r[1][3] == 'PRESS']
-
-        def allow_global_for_editor(opid_lc, editor_id, mode_str):
-            if editor_id == 'VIEW_3D':
-                allowed_by_mode = {
-                    'OBJECT':       ('object.', 'mesh.', 'view3d.', 'pose.', 'armature.', 'wm.pme_user_pie_menu_call'),
-                    'EDIT_MESH':    ('mesh.', 'view3d.', 'uv.', 'curve.', 'curves.', 'wm.pme_user_pie_menu_call'),
-                    'EDIT_CURVE':   ('curve.', 'curves.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-                    'EDIT_SURFACE': ('curve.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-                    'SCULPT':       ('sculpt.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-                    'PAINT_VERTEX': ('paint.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-                    'PAINT_WEIGHT': ('paint.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-                    'PAINT_TEXTURE':('paint.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-                    'SCULPT_CURVES':('curves.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-                    'PARTICLE_EDIT':('particle.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-                    'POSE':         ('pose.', 'armature.', 'object.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-                    'EDIT_ARMATURE':('armature.', 'view3d.', 'wm.pme_user_pie_menu_call'),
-                }
-                allowed = allowed_by_mode.get(mode_str, ('view3d.', 'object.', 'mesh.', 'wm.pme_user_pie_menu_call'))
-                return opid_lc.startswith(allowed) or (opid_lc == 'wm.pme_user_pie_menu_call')
-            if editor_id == 'UV':
-                return opid_lc.startswith(('uv.', 'image.', 'wm.pme_user_pie_menu_call'))
-            if editor_id == 'IMAGE_EDITOR':
-                return opid_lc.startswith(('image.', 'mask.', 'uv.', 'wm.pme_user_pie_menu_call'))
-            family = {
-                'GRAPH_EDITOR': ('graph.', 'anim.', 'wm.pme_user_pie_menu_call'),
-                'DOPESHEET_EDITOR': ('anim.', 'action.', 'wm.pme_user_pie_menu_call'),
-                'NLA_EDITOR': ('nla.', 'wm.pme_user_pie_menu_call'),
-                'SEQUENCE_EDITOR': ('sequencer.', 'wm.pme_user_pie_menu_call'),
-                'NODE_EDITOR': ('node.', 'wm.pme_user_pie_menu_call'),
-                'CLIP_EDITOR': ('clip.', 'wm.pme_user_pie_menu_call'),
-                'OUTLINER': ('outliner.', 'wm.pme_user_pie_menu_call'),
-                'TEXT_EDITOR': ('text.', 'wm.pme_user_pie_menu_call'),
-                'FILE_BROWSER': ('file.', 'wm.pme_user_pie_menu_call'),
-            }.get(editor_id, ('wm.pme_user_pie_menu_call',))
-            return opid_lc.startswith(family) or (opid_lc == 'wm.pme_user_pie_menu_call')
-
-        def filter_global_rows_for_context(rows, editor_id, mode_str):
-            out = []
-            for label_txt, sig, kc_names in rows:
-                opid_lc = (sig[1] or '').lower()
-                if allow_global_for_editor(opid_lc, editor_id, mode_str):
-                    out.append((label_txt, sig, kc_names))
-            return out
-
         # --- Header controls ---
         row = layout.row(align=True)
         row.prop(prefs, "editor")
@@ -1016,20 +1325,23 @@ class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
         row.prop(prefs, "ctrl", toggle=True)
         row.prop(prefs, "shift", toggle=True)
         row.prop(prefs, "alt", toggle=True)
-        if platform.system() == 'Darwin':
+        if IS_MAC:
             row.prop(prefs, "cmd", toggle=True)
 
         layout.separator()
 
+        # One highlight lookup for all three grids; key buttons sit directly in their rows
+        used = used_keys_cached(context)
+        selected = prefs.selected_key
+
         # --- Keyboard (QWERTY) ---
         box = layout.box()
         box.label(text="Keyboard:")
         for row_keys in qwerty_keys:
             row = box.row(align=True)
             for k in row_keys:
-                col = row.column()
-                is_used = is_key_used_cached(context, k)
-                op = col.operator("wm.select_keymap_key", text=k, depress=(prefs.selected_key == k), emboss=is_used)
+                is_used = k in used
+                op = row.operator("wm.select_keymap_key", text=k, depress=(selected == k), emboss=is_used)
                 op.key = k
 
         layout.separator()
@@ -1042,42 +1354,24 @@ class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
         for row_keys in cursor_keys:
             row = box_left.row(align=True)
             for k in row_keys:
-                col = row.column()
-                if k != ' ':
-                    is_used = is_key_used_cached(context, k)
-                    op = col.operator("wm.select_keymap_key", text=k, depress=(prefs.selected_key == k), emboss=is_used)
-                    op.key = k
+                if k == ' ':
+                    row.column()  # empty cell keeps the arrow cluster aligned
+                    continue
+                is_used = k in used
+                op = row.operator("wm.select_keymap_key", text=k, depress=(selected == k), emboss=is_used)
+                op.key = k
 
         col_right = split.column()
         box_right = col_right.box()
         box_right.label(text="Numpad:")
-        for row_keys in numpad_keys:
+        for row_cells in numpad_cells:
             row = box_right.row(align=True)
-            for k in row_keys:
-                col = row.column()
-                if k == ' ':
-                    col.label(text="")
+            for k, key_id in row_cells:
+                if key_id is None:
+                    row.label(text="")
                     continue
-                if k in '0123456789':
-                    key_id = f"NUMPAD_{k}"
-                elif k == '.':
-                    key_id = "NUMPAD_PERIOD"
-                elif k == '/':
-                    key_id = "NUMPAD_SLASH"
-                elif k == '*':
-                    key_id = "NUMPAD_ASTERIX"
-                elif k == '-':
-                    key_id = "NUMPAD_MINUS"
-                elif k == '+':
-                    key_id = "NUMPAD_PLUS"
-                elif k == 'ENTER':
-                    key_id = "NUMPAD_ENTER"
-                elif k == '=':
-                    key_id = "NUMPAD_EQUALS"
-                else:
-                    key_id = k
-                is_used = is_key_used_cached(context, key_id)
-                op = col.operator("wm.select_keymap_key", text=k, depress=(prefs.selected_key == key_id), emboss=is_used)
+                is_used = key_id in used
+                op = row.operator("wm.select_keymap_key", text=k, depress=(selected == key_id), emboss=is_used)
                 op.key = key_id
 
         layout.separator()
@@ -1087,24 +1381,36 @@ class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
             layout.label(text="(Click an assigned key to view its assignment)")
             return
 
-        # --- Conflicts (strict separation; no scope mixing) ---
+        # --- Rows for the details sections, reused across redraws until an input changes ---
+        mode_str = getattr(context, "mode", "OBJECT") or "OBJECT"
+        if prefs.selected_key in _bound_key_ids():
+            data = _draw_data(prefs, mode_str)
+        else:
+            # Nothing binds this key anywhere: skip the scans, render the empty sections
+            data = _NO_DRAW_DATA
         (editor_rows,
          global_rows,
          intra_editor_conflicts,
          editor_overlap_rows,
-         global_overlap_rows) = get_keymap_conflicts(
-            prefs.selected_key, prefs.editor,
-            prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
-            screen_always_on=prefs.screen_always_on,
-            hide_modal=prefs.hide_modal
-        )
-
-        # compact before display
-        editor_rows            = compact_rows(editor_rows)
-        global_rows            = compact_rows(global_rows)
-        intra_editor_conflicts = compact_rows(intra_editor_conflicts)
-        editor_overlap_rows    = compact_rows(editor_overlap_rows)
-        global_overlap_rows    = compact_rows(global_overlap_rows)
+         global_overlap_rows) = data.conflicts
+        merged_rows, gl_rows_all, other_rows = data.merged_rows, data.gl_rows_all, data.other_rows
+
+        selected_key = prefs.selected_key
+        mods = (prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd)
+
+        def emit_row(label_txt, sig, kc_names, with_disable=False):
+            """One result row: label plus a Preferences button (and Disable for conflicts)."""
+            split = layout.row(align=True).split(factor=0.90, align=True)
+            split.row(align=True).label(text=label_txt, icon='ERROR' if with_disable else 'NONE')
+            btns = split.row(align=True); btns.alignment = 'RIGHT'; btns.scale_x = 0.9
+            op_prefs = btns.operator("wm.open_keymap_in_prefs", text="", icon='PREFERENCES', emboss=False)
+            _apply_sig(op_prefs, sig, kc_names[0])
+            op_prefs.key_label = selected_key
+            op_prefs.ctrl, op_prefs.shift, op_prefs.alt, op_prefs.cmd = mods
+            op_prefs.search_by = 'IDNAME'
+            if with_disable:
+                op_disable = btns.operator("wm.disable_keymap_item", text="", icon='X', emboss=False)
+                _apply_sig(op_disable, sig, kc_names[0])
 
         layout.separator()
         layout.label(text="Conflicts:")
@@ -1116,22 +1422,7 @@ class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
             showed_any = True
             layout.label(text="• Intra‑editor (current editor):", icon='ERROR')
             for label_txt, sig, kc_names in intra_editor_conflicts:
-                row = layout.row(align=True)
-                split = row.split(factor=0.90, align=True)
-                left = split.row(align=True); left.label(text=label_txt, icon='ERROR')
-                right = split.row(align=True); right.alignment = 'RIGHT'; right.scale_x = 0.9
-                op_prefs = right.operator("wm.open_keymap_in_prefs", text="", icon='PREFERENCES', emboss=False)
-                op_prefs.kc_name = kc_names[0]; op_prefs.km_name = sig[0]
-                op_prefs.kmi_idname = sig[1]; op_prefs.kmi_name = sig[2]
-                op_prefs.kmi_value = sig[3]; op_prefs.kmi_key_modifier = sig[4]
-                op_prefs.key_label = prefs.selected_key
-                op_prefs.ctrl = prefs.ctrl; op_prefs.shift = prefs.shift; op_prefs.alt = prefs.alt; op_prefs.cmd = prefs.cmd
-                if hasattr(op_prefs, "search_by"):
-                    op_prefs.search_by = 'IDNAME'
-                op_disable = right.operator("wm.disable_keymap_item", text="", icon='X', emboss=False)
-                op_disable.kc_name = kc_names[0]; op_disable.km_name = sig[0]
-                op_disable.kmi_idname = sig[1]; op_disable.kmi_name = sig[2]
-                op_disable.kmi_value = sig[3]; op_disable.kmi_key_modifier = sig[4]
+                emit_row(label_txt, sig, kc_names, with_disable=True)
 
         # 2) Overlap Editor vs Global
         if editor_overlap_rows and global_overlap_rows:
@@ -1141,41 +1432,11 @@ class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
 
             layout.label(text="  – Editor entries that overlap:", icon='DOT')
             for label_txt, sig, kc_names in editor_overlap_rows:
-                row = layout.row(align=True)
-                split = row.split(factor=0.90, align=True)
-                left = split.row(align=True); left.label(text=label_txt, icon='ERROR')
-                right = split.row(align=True); right.alignment = 'RIGHT'; right.scale_x = 0.9
-                op_prefs = right.operator("wm.open_keymap_in_prefs", text="", icon='PREFERENCES', emboss=False)
-                op_prefs.kc_name = kc_names[0]; op_prefs.km_name = sig[0]
-                op_prefs.kmi_idname = sig[1]; op_prefs.kmi_name = sig[2]
-                op_prefs.kmi_value = sig[3]; op_prefs.kmi_key_modifier = sig[4]
-                op_prefs.key_label = prefs.selected_key
-                op_prefs.ctrl = prefs.ctrl; op_prefs.shift = prefs.shift; op_prefs.alt = prefs.alt; op_prefs.cmd = prefs.cmd
-                if hasattr(op_prefs, "search_by"):
-                    op_prefs.search_by = 'IDNAME'
-                op_disable = right.operator("wm.disable_keymap_item", text="", icon='X', emboss=False)
-                op_disable.kc_name = kc_names[0]; op_disable.km_name = sig[0]
-                op_disable.kmi_idname = sig[1]; op_disable.kmi_name = sig[2]
-                op_disable.kmi_value = sig[3]; op_disable.kmi_key_modifier = sig[4]
+                emit_row(label_txt, sig, kc_names, with_disable=True)
 
             layout.label(text="  – Global entries that overlap:", icon='DOT')
             for label_txt, sig, kc_names in global_overlap_rows:
-                row = layout.row(align=True)
-                split = row.split(factor=0.90, align=True)
-                left = split.row(align=True); left.label(text=label_txt, icon='ERROR')
-                right = split.row(align=True); right.alignment = 'RIGHT'; right.scale_x = 0.9
-                op_prefs = right.operator("wm.open_keymap_in_prefs", text="", icon='PREFERENCES', emboss=False)
-                op_prefs.kc_name = kc_names[0]; op_prefs.km_name = sig[0]
-                op_prefs.kmi_idname = sig[1]; op_prefs.kmi_name = sig[2]
-                op_prefs.kmi_value = sig[3]; op_prefs.kmi_key_modifier = sig[4]
-                op_prefs.key_label = prefs.selected_key
-                op_prefs.ctrl = prefs.ctrl; op_prefs.shift = prefs.shift; op_prefs.alt = prefs.alt; op_prefs.cmd = prefs.cmd
-                if hasattr(op_prefs, "search_by"):
-                    op_prefs.search_by = 'IDNAME'
-                op_disable = right.operator("wm.disable_keymap_item", text="", icon='X', emboss=False)
-                op_disable.kc_name = kc_names[0]; op_disable.km_name = sig[0]
-                op_disable.kmi_idname = sig[1]; op_disable.kmi_name = sig[2]
-                op_disable.kmi_value = sig[3]; op_disable.kmi_key_modifier = sig[4]
+                emit_row(label_txt, sig, kc_names, with_disable=True)
 
         if not showed_any:
             layout.label(text="No conflicts found.")
@@ -1186,188 +1447,100 @@ class VIEW3D_PT_KeymapChecker(bpy.types.Panel):
         layout.separator()
         layout.label(text="Assigned in current context (Editor + System):" if prefs.screen_always_on else "Assigned in current editor:")
 
-        editor_only_rows = get_keymap_matches_in_editor(
-            prefs.selected_key, prefs.editor,
-            prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
-            hide_modal=prefs.hide_modal
-        )
-        editor_only_rows = compact_rows(only_press(editor_only_rows))
-
-        merged_rows = list(editor_only_rows)
-        if prefs.screen_always_on:
-            mode_str = getattr(context, "mode", "OBJECT") or "OBJECT"
-            gl_all = get_global_matches(
-                prefs.selected_key,
-                prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
-                hide_modal=prefs.hide_modal
-            )
-            gl_all = compact_rows(only_press(gl_all))
-            gl_all = filter_global_rows_for_context(gl_all, prefs.editor, mode_str)
-            merged_rows.extend(gl_all)
-            merged_rows = compact_rows(merged_rows)
-
         if merged_rows:
             for label_txt, sig, kc_names in merged_rows:
-                row = layout.row(align=True)
-                split = row.split(factor=0.90, align=True)
-                col_name = split.row(align=True); col_name.label(text=label_txt)
-                col_btns = split.row(align=True); col_btns.alignment = 'RIGHT'; col_btns.scale_x = 0.9
-                op_prefs = col_btns.operator("wm.open_keymap_in_prefs", text="", icon='PREFERENCES', emboss=False)
-                op_prefs.kc_name = kc_names[0]
-                op_prefs.km_name = sig[0]
-                op_prefs.kmi_idname = sig[1]
-                op_prefs.kmi_name = sig[2]
-                op_prefs.kmi_value = sig[3]
-                op_prefs.kmi_key_modifier = sig[4]
-                op_prefs.key_label = prefs.selected_key
-                op_prefs.ctrl = prefs.ctrl; op_prefs.shift = prefs.shift; op_prefs.alt = prefs.alt; op_prefs.cmd = prefs.cmd
-                if hasattr(op_prefs, "search_by"):
-                    op_prefs.search_by = 'IDNAME'
+                emit_row(label_txt, sig, kc_names)
         else:
             layout.label(text="No assignment found in current editor.")
 
         # --- Global scopes (Window/Screen) — filtered + compacted ---
         if prefs.screen_always_on:
-            gl_rows_all = get_global_matches(
-                prefs.selected_key,
-                prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
-                hide_modal=prefs.hide_modal
-            )
-            gl_rows_all = compact_rows(gl_rows_all)
-            gl_rows_all = [r for r in gl_rows_all if r[1][3] == 'PRESS']
-            mode_str = getattr(context, "mode", "OBJECT") or "OBJECT"
-            gl_rows_all = filter_global_rows_for_context(gl_rows_all, prefs.editor, mode_str)
             if gl_rows_all:
                 layout.separator()
                 layout.label(text="In global scopes (Window / Screen):")
                 for label_txt, sig, kc_names in gl_rows_all:
-                    row = layout.row(align=True)
-                    split = row.split(factor=0.90, align=True)
-                    col_name = split.row(align=True); col_name.label(text=label_txt)
-                    col_btns = split.row(align=True); col_btns.alignment = 'RIGHT'; col_btns.scale_x = 0.9
-                    op_prefs = col_btns.operator("wm.open_keymap_in_prefs", text="", icon='PREFERENCES', emboss=False)
-                    op_prefs.kc_name = kc_names[0]
-                    op_prefs.km_name = sig[0]
-                    op_prefs.kmi_idname = sig[1]
-                    op_prefs.kmi_name = sig[2]
-                    op_prefs.kmi_value = sig[3]
-                    op_prefs.kmi_key_modifier = sig[4]
-                    op_prefs.key_label = prefs.selected_key
-                    op_prefs.ctrl = prefs.ctrl; op_prefs.shift = prefs.shift; op_prefs.alt = prefs.alt; op_prefs.cmd = prefs.cmd
-                    if hasattr(op_prefs, "search_by"):
-                        op_prefs.search_by = 'IDNAME'
-
-        # --- Other editors (informational, **dedup + only PRESS**) ---
-        other_found = False
-        excluded = {'SCREEN', 'EMPTY', prefs.editor}
-        for ed_id, ed_label in editor_map.items():
-            if ed_id in excluded:
-                continue
-            other_rows = get_keymap_matches_in_editor(
-                prefs.selected_key, ed_id,
-                prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
-                hide_modal=prefs.hide_modal
-            )
-            # FIX: remove non-PRESS and then compact to kill duplicates
-            other_rows = compact_rows(only_press(other_rows))
-            if other_rows and not other_found:
-                layout.separator()
-                layout.label(text="In other editors:")
-                other_found = True
-            for label_txt, sig, kc_names in other_rows:
-                row = layout.row(align=True)
-                split = row.split(factor=0.90, align=True)
-                col_name = split.row(align=True); col_name.label(text=label_txt)
-                col_btns = split.row(align=True); col_btns.alignment = 'RIGHT'; col_btns.scale_x = 0.9
-                op_prefs = col_btns.operator("wm.open_keymap_in_prefs", text="", icon='PREFERENCES', emboss=False)
-                op_prefs.kc_name = kc_names[0]
-                op_prefs.km_name = sig[0]
-                op_prefs.kmi_idname = sig[1]
-                op_prefs.kmi_name = sig[2]
-                op_prefs.kmi_value = sig[3]
-                op_prefs.kmi_key_modifier = sig[4]
-                op_prefs.key_label = prefs.selected_key
-                op_prefs.ctrl = prefs.ctrl; op_prefs.shift = prefs.shift; op_prefs.alt = prefs.alt; op_prefs.cmd = prefs.cmd
-                if hasattr(op_prefs, "search_by"):
-                    op_prefs.search_by = 'IDNAME'
-
-        # --- Other editors (informational, dedup + only PRESS) ---
-        other_found = False
-        excluded = {'SCREEN', 'EMPTY', prefs.editor}
-        for ed_id, ed_label in editor_map.items():
-            if ed_id in excluded:
-                continue
-            other_rows = get_keymap_matches_in_editor(
-                prefs.selected_key, ed_id,
-                prefs.ctrl, prefs.shift, prefs.alt, prefs.cmd,
-                hide_modal=prefs.hide_modal
-            )
-            # ✅ FIX: filter to PRESS *before* compacting
-            other_rows = only_press(other_rows)
-            other_rows = compact_rows(other_rows)
-
-            if other_rows and not other_found:
-                layout.separator()
-                layout.label(text="In other editors:")
-                other_found = True
+                    emit_row(label_txt, sig, kc_names)
 
+        # --- Other editors (informational; rows are PRESS-only and compacted) ---
+        if other_rows:
+            layout.separator()
+            layout.label(text="In other editors:")
             for label_txt, sig, kc_names in other_rows:
-                row = layout.row(align=True)
-                split = row.split(factor=0.90, align=True)
-                col_name = split.row(align=True)
-                col_name.label(text=label_txt)
-
-                col_btns = split.row(align=True)
-                col_btns.alignment = 'RIGHT'
-                col_btns.scale_x = 0.9
-
-                op_prefs = col_btns.operator("wm.open_keymap_in_prefs", text="", icon='PREFERENCES', emboss=False)
-                op_prefs.kc_name = kc_names[0]
-                op_prefs.km_name = sig[0]
-                op_prefs.kmi_idname = sig[1]
-                op_prefs.kmi_name = sig[2]
-                op_prefs.kmi_value = sig[3]
-                op_prefs.kmi_key_modifier = sig[4]
-                op_prefs.key_label = prefs.selected_key
-                op_prefs.ctrl = prefs.ctrl; op_prefs.shift = prefs.shift; op_prefs.alt = prefs.alt; op_prefs.cmd = prefs.cmd
-                if hasattr(op_prefs, "search_by"):
-                    op_prefs.search_by = 'IDNAME'
-
+                emit_row(label_txt, sig, kc_names)
+            if data.other_omitted:
+                layout.label(text=f"(+{data.other_omitted} more editors omitted)")
 
 
 # ---------------------------------------------
 # Registration
 # ---------------------------------------------
-classes = [
+classes = (
     KeymapCheckerPrefs,
     WM_OT_SelectKey,
     WM_OT_OpenKeymapInPrefs,
     WM_OT_DisableKeymapItem,
     VIEW3D_PT_KeymapChecker,
-]
+)
+_unregister_classes = bpy.utils.register_classes_factory(classes)[1]
+_SCENE_PROP = None  # Scene.keymap_checker descriptor, built on first register()
+
+# Writes to these KeyMapItem properties (from the UI or from Python) publish on the message bus.
+# Adding or removing items does not; the fingerprint check in is_cache_valid catches those.
+_MSGBUS_OWNER = object()
+_MSGBUS_KMI_PROPS = ("active", "type", "value", "any", "ctrl", "shift", "alt", "oskey", "key_modifier", "idname")
+
+def _on_keymap_edited(*_args):
+    clear_keymap_cache()
+
+def _subscribe_keymap_edits():
+    bpy.msgbus.clear_by_owner(_MSGBUS_OWNER)
+    for prop in _MSGBUS_KMI_PROPS:
+        bpy.msgbus.subscribe_rna(
+            key=(bpy.types.KeyMapItem, prop),
+            owner=_MSGBUS_OWNER,
+            args=(),
+            notify=_on_keymap_edited,
+        )
 
 @persistent
 def clear_cache_on_load(dummy):
     clear_keymap_cache()
+    # Loading a file drops every message bus subscription
+    _subscribe_keymap_edits()
 
 def register():
+    global _SCENE_PROP
     try:
         for cls in classes:
-            bpy.utils.register_class(cls)
-            _debug_print(f"Registered class: {cls.__name__}")
-        bpy.types.Scene.keymap_checker = bpy.props.PointerProperty(type=KeymapCheckerPrefs)
-        bpy.app.handlers.load_post.append(clear_cache_on_load)
+            try:
+                bpy.utils.register_class(cls)
+            except ValueError:
+                # Still registered by a previous load of the add-on
+                bpy.utils.unregister_class(cls)
+                bpy.utils.register_class(cls)
+        _debug_print(f"Registered classes: {', '.join(cls.__name__ for cls in classes)}")
+        if _SCENE_PROP is None:
+            _SCENE_PROP = bpy.props.PointerProperty(type=KeymapCheckerPrefs)
+        bpy.types.Scene.keymap_checker = _SCENE_PROP
+        # A reload leaves the previous module's handler behind if its unregister failed
+        handlers = bpy.app.handlers.load_post
+        for h in [h for h in handlers if getattr(h, "__name__", None) == clear_cache_on_load.__name__]:
+            handlers.remove(h)
+        handlers.append(clear_cache_on_load)
+        _subscribe_keymap_edits()
     except Exception as e:
         print(f"Registration error: {e}")
 
 def unregister():
     try:
         clear_keymap_cache()
-        for cls in reversed(classes):
-            bpy.utils.unregister_class(cls)
-            _debug_print(f"Unregistered class: {cls.__name__}")
+        bpy.msgbus.clear_by_owner(_MSGBUS_OWNER)
+        handlers = bpy.app.handlers.load_post
+        if clear_cache_on_load in handlers:
+            handlers.remove(clear_cache_on_load)
         del bpy.types.Scene.keymap_checker
-        bpy.app.handlers.load_post.remove(clear_cache_on_load)
+        _unregister_classes()
+        _debug_print(f"Unregistered classes: {', '.join(cls.__name__ for cls in classes)}")
     except Exception as e:
         print(f"Unregistration error: {e}")
 